@@ -4,126 +4,299 @@ Performance Benchmark Script for Voice Transcriber Optimizations
 Tests and measures actual performance improvements in the optimized version.
 """
 
+import sys
 import time
+import timeit
 import io
-import wave
+import struct
 import pyaudio
 import re
 import tempfile
 import os
+import multiprocessing
+from contextlib import redirect_stdout
 from pathlib import Path
+from importlib.util import find_spec
+
+if find_spec('numpy') is None:
+    sys.exit("❌ NumPy not installed. Run inside the app's venv: ./venv/bin/python benchmark_performance.py")
+
+import numpy as np
+
+try:
+    from numba import njit  # Optional: JIT-compiled filler scanner
+except ImportError:
+    njit = None
+
+try:
+    import soundfile  # Optional: compressed upload formats
+except ImportError:
+    soundfile = None
+
+# Timed loops are repeated and the fastest run is reported (least noisy)
+TIMING_REPEATS = 5
+
+# Filler words removed by the text-processing benchmark
+FILLER_WORDS = frozenset({
+    'um', 'uh', 'er', 'ah', 'like', 'you know', 'so', 'well',
+    'hmm', 'okay', 'right', 'actually', 'basically', 'literally',
+    'i mean', 'sort of', 'kind of', 'you see'
+})
+
+# Punctuation the original filler loop strips from each candidate phrase
+FILLER_PUNCTUATION = '.,!?;:"()[]{}'
+FNV_OFFSET = 0xcbf29ce484222325
+FNV_PRIME = 0x100000001b3
 
 def create_test_audio_data(duration_seconds=2, sample_rate=16000):
     """Create test audio data for benchmarking"""
-    import numpy as np
-    
-    # Generate a simple sine wave for testing
+    # Generate a simple sine wave for testing, in float32 and in place so
+    # no float64 temporaries are allocated
     frequency = 440  # A4 note
     frames = int(duration_seconds * sample_rate)
-    t = np.linspace(0, duration_seconds, frames, False)
-    audio_data = np.sin(2 * np.pi * frequency * t) * 0.3
-    
-    # Convert to 16-bit integers
-    audio_16bit = (audio_data * 32767).astype(np.int16)
-    
-    # Convert to bytes (chunks of 4096 samples)
-    chunk_size = 4096
-    audio_chunks = []
-    for i in range(0, len(audio_16bit), chunk_size):
-        chunk = audio_16bit[i:i + chunk_size]
-        audio_chunks.append(chunk.tobytes())
-    
-    return audio_chunks
+    audio_data = np.arange(frames, dtype=np.float32)
+    audio_data *= np.float32(2 * np.pi * frequency / sample_rate)
+    np.sin(audio_data, out=audio_data)
+    audio_data *= np.float32(0.3 * 32767)
+    np.rint(audio_data, out=audio_data)
+    
+    # Convert to 16-bit PCM bytes
+    return audio_data.astype(np.int16).tobytes()
+
+def best_time_ms(stmt, iterations, namespace=None):
+    """Best-of-TIMING_REPEATS time per call of stmt (callable or source), in ms"""
+    timer = timeit.Timer(stmt, globals=namespace)
+    return min(timer.repeat(repeat=TIMING_REPEATS, number=iterations)) / iterations * 1000
+
+def create_wav_header(num_bytes, channels, rate, sample_width):
+    """Build the 44-byte PCM WAV header for a payload of num_bytes"""
+    block_align = channels * sample_width
+    return struct.pack(
+        '<4sI4s4sIHHIIHH4sI',
+        b'RIFF', 36 + num_bytes, b'WAVE',
+        b'fmt ', 16, 1, channels, rate, rate * block_align, block_align, sample_width * 8,
+        b'data', num_bytes
+    )
+
+def build_trie_pattern(words):
+    """Build a prefix-factored regex alternation (a trie) matching any of words"""
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = {}  # End-of-word marker
+    
+    def to_regex(node):
+        # A space inside a phrase stands for any whitespace run, as with str.split()
+        branches = [(r'\s+' if char == ' ' else re.escape(char)) + to_regex(child)
+                    for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        if len(branches) == 1 and '' not in node:
+            return branches[0]
+        group = '(?:' + '|'.join(branches) + ')'
+        return group + '?' if '' in node else group
+    
+    return to_regex(trie)
+
+# Compiled once at import (trie-factored: shared prefixes such as "so"/"sort of"
+# or "um"/"uh" are tested once per position). Like the original loop, a
+# filler is a whole whitespace-delimited phrase with any FILLER_PUNCTUATION
+# around it, so "um," goes with its comma and "so-called" is left alone
+_FILLER_PUNCT_CLASS = '[' + re.escape(FILLER_PUNCTUATION) + ']*'
+FILLER_PATTERN = re.compile(
+    r'(?<!\S)' + _FILLER_PUNCT_CLASS + '(?:' + build_trie_pattern(FILLER_WORDS) + ')' + _FILLER_PUNCT_CLASS + r'(?!\S)'
+)
+
+# Transcripts the text cleaners must agree on before they are timed
+TEXT_CORPUS = (
+    "Um, well, you know, this is like actually a test sentence, um, with basically many filler words, you see, that need to be, uh, removed from the transcription, I mean, for better readability, sort of.",
+    "Um, well, you know, this is like actually a test. So, I mean, basically it works.",
+    "The so-called fix is, like, well-tested (um) and ready. Okay?",
+)
+
+def optimized_clean_text(text):
+    """Remove filler words in one regex pass, with the original loop's output"""
+    # The original lowercases and re-joins tokens with single spaces
+    return ' '.join(FILLER_PATTERN.sub(' ', text.lower()).split())
+
+def fnv1a(data):
+    """64-bit FNV-1a hash of a byte string"""
+    h = FNV_OFFSET
+    for byte in data:
+        h = ((h ^ byte) * FNV_PRIME) & 0xFFFFFFFFFFFFFFFF
+    return h
+
+def _strip_filler_words_loop(text, filler_hashes, max_words, punct, out):
+    """Drop 1..max_words-word filler phrases from lowercase UTF-8 bytes (Numba kernel)"""
+    n = text.shape[0]
+    
+    # Whitespace tokenization, like str.split()
+    starts = np.empty(n, dtype=np.int64)
+    ends = np.empty(n, dtype=np.int64)
+    count = 0
+    i = 0
+    while i < n:
+        while i < n and (text[i] == 32 or 9 <= text[i] <= 13):
+            i += 1
+        if i >= n:
+            break
+        starts[count] = i
+        while i < n and not (text[i] == 32 or 9 <= text[i] <= 13):
+            i += 1
+        ends[count] = i
+        count += 1
+    
+    phrase = np.empty(n, dtype=np.uint8)
+    o = 0
+    w = 0
+    while w < count:
+        skip = 0
+        for length in range(max_words, 0, -1):
+            if w + length > count:
+                continue
+            # ' '.join(words[w:w+length]) into the scratch buffer...
+            p = 0
+            for k in range(w, w + length):
+                if k > w:
+                    phrase[p] = 32
+                    p += 1
+                for c in range(starts[k], ends[k]):
+                    phrase[p] = text[c]
+                    p += 1
+            # ...then .strip(FILLER_PUNCTUATION) and hash what is left
+            lo = 0
+            while lo < p and punct[phrase[lo]]:
+                lo += 1
+            while p > lo and punct[phrase[p - 1]]:
+                p -= 1
+            h = np.uint64(FNV_OFFSET)
+            for c in range(lo, p):
+                h = (h ^ np.uint64(phrase[c])) * np.uint64(FNV_PRIME)
+            idx = np.searchsorted(filler_hashes, h)
+            if idx < filler_hashes.shape[0] and filler_hashes[idx] == h:
+                skip = length
+                break
+        if skip:
+            w += skip
+            continue
+        if o > 0:
+            out[o] = 32
+            o += 1
+        for c in range(starts[w], ends[w]):
+            out[o] = text[c]
+            o += 1
+        w += 1
+    return o
+
+def make_jit_clean_text(filler_words):
+    """Build a clean_text equivalent backed by the Numba filler scanner"""
+    kernel = njit(cache=True)(_strip_filler_words_loop)
+    filler_hashes = np.array(sorted(fnv1a(w.encode()) for w in filler_words), dtype=np.uint64)
+    max_words = max(w.count(' ') + 1 for w in filler_words)
+    punct = np.zeros(256, dtype=np.bool_)
+    punct[list(FILLER_PUNCTUATION.encode())] = True
+    
+    def jit_clean_text(text):
+        data = np.frombuffer(text.lower().encode(), dtype=np.uint8)
+        out = np.empty(data.shape[0], dtype=np.uint8)
+        n = kernel(data, filler_hashes, max_words, punct, out)
+        return out[:n].tobytes().decode()
+    
+    return jit_clean_text
 
 def benchmark_file_io_vs_memory():
     """Benchmark file I/O vs in-memory audio processing"""
     print("🧪 Benchmarking File I/O vs In-Memory Processing...")
     
-    # Create test audio data
-    audio_chunks = create_test_audio_data(duration_seconds=3)
-    audio = pyaudio.PyAudio()
-    format_val = pyaudio.paInt16
+    # Create test audio data (joined once, outside the timed loops)
+    audio_bytes = create_test_audio_data(duration_seconds=3)
     channels = 1
     rate = 16000
     
+    # Fixed format, so the header is built once and reused by both paths
+    header = create_wav_header(len(audio_bytes), channels, rate, pyaudio.get_sample_size(pyaudio.paInt16))
+    
     iterations = 50
     
     # Test 1: File-based approach (original)
-    file_times = []
-    for i in range(iterations):
-        start_time = time.perf_counter()
-        
-        # Create temporary file
-        temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.wav')
-        
+    # One temp file for the whole run: each iteration truncates, writes and
+    # reads it back through the same descriptor, so the timings cover the
+    # disk round-trip rather than file creation/unlink
+    temp_fd, temp_path = tempfile.mkstemp(suffix='.wav')
+    
+    def file_round_trip():
         # Write WAV file
-        with wave.open(temp_file.name, 'wb') as wf:
-            wf.setnchannels(channels)
-            wf.setsampwidth(audio.get_sample_size(format_val))
-            wf.setframerate(rate)
-            wf.writeframes(b''.join(audio_chunks))
+        os.lseek(temp_fd, 0, os.SEEK_SET)
+        os.ftruncate(temp_fd, 0)
+        os.write(temp_fd, header)
+        os.write(temp_fd, audio_bytes)
         
         # Read it back (simulate API call preparation)
-        with open(temp_file.name, 'rb') as f:
-            data = f.read()
-        
+        os.lseek(temp_fd, 0, os.SEEK_SET)
+        return os.read(temp_fd, len(header) + len(audio_bytes))
+    
+    try:
+        file_time = best_time_ms(file_round_trip, iterations)
+    finally:
         # Cleanup
-        os.unlink(temp_file.name)
-        
-        end_time = time.perf_counter()
-        file_times.append((end_time - start_time) * 1000)  # Convert to ms
+        os.close(temp_fd)
+        os.unlink(temp_path)
     
     # Test 2: In-memory approach (optimized)
-    memory_times = []
-    for i in range(iterations):
-        start_time = time.perf_counter()
-        
-        # Create in-memory buffer
-        audio_buffer = io.BytesIO()
-        
+    def memory_round_trip():
         # Write WAV data to memory
-        with wave.open(audio_buffer, 'wb') as wf:
-            wf.setnchannels(channels)
-            wf.setsampwidth(audio.get_sample_size(format_val))
-            wf.setframerate(rate)
-            wf.writeframes(b''.join(audio_chunks))
+        audio_buffer = io.BytesIO()
+        audio_buffer.write(header)
+        audio_buffer.write(audio_bytes)
         
         # Get data (simulate API call preparation)
-        audio_buffer.seek(0)
-        data = audio_buffer.getvalue()
-        
-        end_time = time.perf_counter()
-        memory_times.append((end_time - start_time) * 1000)  # Convert to ms
+        return audio_buffer.getvalue()
     
-    audio.terminate()
+    memory_time = best_time_ms(memory_round_trip, iterations)
     
     # Calculate statistics
-    avg_file_time = sum(file_times) / len(file_times)
-    avg_memory_time = sum(memory_times) / len(memory_times)
-    improvement = ((avg_file_time - avg_memory_time) / avg_file_time) * 100
-    
-    print(f"📊 File I/O Benchmark Results ({iterations} iterations):")
-    print(f"   File-based approach: {avg_file_time:.2f}ms average")
-    print(f"   In-memory approach:  {avg_memory_time:.2f}ms average")
-    print(f"   🚀 Improvement: {improvement:.1f}% faster ({avg_file_time - avg_memory_time:.2f}ms saved)")
+    improvement = ((file_time - memory_time) / file_time) * 100
+    
+    print(f"📊 File I/O Benchmark Results ({iterations} iterations, best of {TIMING_REPEATS}):")
+    print(f"   File-based approach: {file_time:.2f}ms per call")
+    print(f"   In-memory approach:  {memory_time:.2f}ms per call")
+    print(f"   🚀 Improvement: {improvement:.1f}% faster ({file_time - memory_time:.2f}ms saved)")
+    
+    # Test 3: Compressed in-memory uploads (encode time vs bytes on the wire).
+    # Raw headerless PCM is not an option: the transcription APIs only take
+    # containers (wav, flac, ogg, mp3, ...)
+    wav_size = len(header) + len(audio_bytes)
+    if soundfile is None:
+        print("   Compressed formats: skipped (pip install soundfile)")
+    else:
+        samples = np.frombuffer(audio_bytes, dtype=np.int16)
+        print(f"   WAV payload: {wav_size} bytes")
+        for label, file_format, subtype in (("FLAC", 'FLAC', 'PCM_16'), ("Opus", 'OGG', 'OPUS')):
+            def encode():
+                audio_buffer = io.BytesIO()
+                soundfile.write(audio_buffer, samples, rate, format=file_format, subtype=subtype)
+                return audio_buffer.getvalue()
+            
+            encode_time = best_time_ms(encode, iterations)
+            data = encode()
+            print(f"   {label} in-memory: {encode_time:.2f}ms per call, "
+                  f"{len(data)} bytes ({len(data) / wav_size * 100:.0f}% of WAV)")
     
-    return avg_file_time - avg_memory_time
+    return file_time - memory_time
 
 def benchmark_text_processing():
     """Benchmark text processing optimizations"""
     print("\n🧪 Benchmarking Text Processing...")
     
     # Test text with filler words
-    test_text = "Um, well, you know, this is like actually a test sentence, um, with basically many filler words, you see, that need to be, uh, removed from the transcription, I mean, for better readability, sort of."
+    test_text = TEXT_CORPUS[0]
     
     iterations = 1000
     
     # Original approach (nested loops)
-    filler_words = {
-        'um', 'uh', 'er', 'ah', 'like', 'you know', 'so', 'well',
-        'hmm', 'okay', 'right', 'actually', 'basically', 'literally',
-        'i mean', 'sort of', 'kind of', 'you see'
-    }
+    filler_words = FILLER_WORDS
     
     def original_clean_text(text):
         words = text.lower().split()
@@ -144,42 +317,45 @@ def benchmark_text_processing():
                 i += 1
         return ' '.join(cleaned_words)
     
-    # Optimized approach (pre-compiled regex)
-    sorted_fillers = sorted(filler_words, key=len, reverse=True)
-    escaped_fillers = [re.escape(filler) for filler in sorted_fillers]
-    pattern = r'\\b(?:' + '|'.join(escaped_fillers) + r')\\b'
-    filler_pattern = re.compile(pattern, re.IGNORECASE)
+    # Optimized approach: module-level FILLER_PATTERN / optimized_clean_text
+    
+    # Speed only means something between cleaners with the same output
+    for text in TEXT_CORPUS:
+        expected = original_clean_text(text)
+        actual = optimized_clean_text(text)
+        assert actual == expected, f"optimized cleaner differs: {actual!r} != {expected!r}"
     
-    def optimized_clean_text(text):
-        return filler_pattern.sub('', text)
+    # Time each approach with the same statement so only the cleaner differs
+    def time_cleaner(clean):
+        return best_time_ms('clean(text)', iterations, {'clean': clean, 'text': test_text})
     
     # Test original approach
-    original_times = []
-    for i in range(iterations):
-        start_time = time.perf_counter()
-        result = original_clean_text(test_text)
-        end_time = time.perf_counter()
-        original_times.append((end_time - start_time) * 1000)
+    original_time = time_cleaner(original_clean_text)
     
     # Test optimized approach
-    optimized_times = []
-    for i in range(iterations):
-        start_time = time.perf_counter()
-        result = optimized_clean_text(test_text)
-        end_time = time.perf_counter()
-        optimized_times.append((end_time - start_time) * 1000)
+    optimized_time = time_cleaner(optimized_clean_text)
+    
+    # Test JIT-compiled scanner (same output as the original loop)
+    jit_time = None
+    if njit is not None:
+        jit_clean_text = make_jit_clean_text(filler_words)
+        for text in TEXT_CORPUS:  # Also compiles before timing
+            assert jit_clean_text(text) == original_clean_text(text), "Numba scanner differs from the original"
+        jit_time = time_cleaner(jit_clean_text)
     
     # Calculate statistics
-    avg_original_time = sum(original_times) / len(original_times)
-    avg_optimized_time = sum(optimized_times) / len(optimized_times)
-    improvement = ((avg_original_time - avg_optimized_time) / avg_original_time) * 100
+    improvement = ((original_time - optimized_time) / original_time) * 100
     
-    print(f"📊 Text Processing Benchmark Results ({iterations} iterations):")
-    print(f"   Original approach:  {avg_original_time:.3f}ms average")
-    print(f"   Optimized approach: {avg_optimized_time:.3f}ms average")
-    print(f"   🚀 Improvement: {improvement:.1f}% faster ({avg_original_time - avg_optimized_time:.3f}ms saved)")
+    print(f"📊 Text Processing Benchmark Results ({iterations} iterations, best of {TIMING_REPEATS}):")
+    print(f"   Original approach:  {original_time:.3f}ms per call")
+    print(f"   Optimized approach: {optimized_time:.3f}ms per call")
+    if jit_time is not None:
+        print(f"   Numba scanner:      {jit_time:.3f}ms per call")
+    else:
+        print("   Numba scanner:      skipped (pip install numba)")
+    print(f"   🚀 Improvement: {improvement:.1f}% faster ({original_time - optimized_time:.3f}ms saved)")
     
-    return avg_original_time - avg_optimized_time
+    return original_time - optimized_time
 
 def benchmark_typing_speed():
     """Benchmark typing speed differences"""
@@ -187,17 +363,10 @@ def benchmark_typing_speed():
     
     test_text = "This is a test sentence for typing speed measurement."
     
-    # Simulate typing delays (without actually typing)
+    # The delays are fixed sleeps, so their cost is computed rather than
+    # slept through (time.sleep would only add scheduler jitter)
     def simulate_typing(text, interval, initial_delay):
-        start_time = time.perf_counter()
-        time.sleep(initial_delay)  # Initial delay
-        
-        # Simulate character-by-character delay
-        for char in text:
-            time.sleep(interval)
-        
-        end_time = time.perf_counter()
-        return (end_time - start_time) * 1000
+        return (initial_delay + len(text) * interval) * 1000
     
     # Original settings
     original_time = simulate_typing(test_text, 0.01, 0.1)
@@ -237,7 +406,7 @@ def benchmark_audio_settings():
             start_time = time.perf_counter()
             
             # Create audio data for this scenario
-            audio_chunks = create_test_audio_data(
+            audio_bytes = create_test_audio_data(
                 duration_seconds=duration, 
                 sample_rate=scenario["sample_rate"]
             )
@@ -245,10 +414,12 @@ def benchmark_audio_settings():
             # Simulate processing overhead
             total_samples = duration * scenario["sample_rate"]
             num_chunks = total_samples // scenario["chunk_size"]
+            chunk_bytes = scenario["chunk_size"] * 2
             
-            # Simulate chunk processing time
-            for chunk in audio_chunks[:num_chunks]:
-                pass  # Simulate minimal processing
+            # Simulate chunk processing time (zero-copy views, like a stream read)
+            audio_view = memoryview(audio_bytes)
+            for offset in range(0, num_chunks * chunk_bytes, chunk_bytes):
+                chunk = audio_view[offset:offset + chunk_bytes]  # Simulate minimal processing
             
             end_time = time.perf_counter()
             times.append((end_time - start_time) * 1000)
@@ -267,26 +438,36 @@ def benchmark_audio_settings():
     
     return savings
 
+def _run_benchmark(benchmark):
+    """Run one benchmark in a worker process and capture its report"""
+    report = io.StringIO()
+    with redirect_stdout(report):
+        savings = benchmark()
+    return report.getvalue(), savings
+
 def main():
     """Run all benchmarks"""
     print("🚀 Voice Transcriber Performance Benchmark")
     print("=" * 50)
     
-    try:
-        import numpy as np
-    except ImportError:
-        print("❌ NumPy not installed. Installing for audio generation...")
-        import subprocess
-        subprocess.check_call(["pip", "install", "numpy"])
-        import numpy as np
-    
     total_savings = 0
     
-    # Run benchmarks
-    total_savings += benchmark_file_io_vs_memory()
-    total_savings += benchmark_text_processing()
-    total_savings += benchmark_typing_speed()
-    total_savings += benchmark_audio_settings()
+    # Run benchmarks side by side, each in a fresh interpreter so one's
+    # allocations/JIT warm-up can't skew another's timings; reports are
+    # printed in order once all have finished
+    benchmarks = [
+        benchmark_file_io_vs_memory,
+        benchmark_text_processing,
+        benchmark_typing_speed,
+        benchmark_audio_settings,
+    ]
+    processes = min(len(benchmarks), os.cpu_count() or 1)
+    with multiprocessing.get_context('spawn').Pool(processes) as pool:
+        results = pool.map(_run_benchmark, benchmarks)
+    
+    for report, savings in results:
+        print(report, end='')
+        total_savings += savings
     
     print("\n" + "=" * 50)
     print(f"📊 TOTAL ESTIMATED PERFORMANCE IMPROVEMENT")
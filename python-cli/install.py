@@ -6,17 +6,68 @@ Automatically sets up the voice transcription app on Windows, macOS, and Linux
 
 import os
 import sys
+import shlex
+import shutil
+import time
+import hashlib
+import json
+import argparse
 import subprocess
 import platform
+import urllib.request
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
-def run_command(command, shell=False):
-    """Run a command and return success status"""
+# Host OS, resolved once
+SYSTEM = platform.system().lower()
+IS_WINDOWS = SYSTEM == "windows"
+IS_MAC = SYSTEM == "darwin"
+IS_LINUX = SYSTEM == "linux"
+
+# The venv's interpreter and pip, pre-split into argv form so Windows
+# backslashes survive
+VENV_BIN = Path("venv") / ("Scripts" if IS_WINDOWS else "bin")
+PYTHON_CMD = (str(VENV_BIN / "python"),)
+PIP_CMD = (str(VENV_BIN / "pip"),)
+
+# Parallel pip downloads; beyond a few the link is saturated anyway
+DEFAULT_JOBS = min(os.cpu_count() or 1, 4)
+
+# Debian/Ubuntu packages needed to build pyaudio
+LINUX_PACKAGES = ("portaudio19-dev", "python3-dev")
+
+# Launcher scripts, encoded once (the batch file keeps CRLF line endings)
+LAUNCHER_BAT = """@echo off
+echo Starting Voice Transcriber...
+cd /d "%~dp0"
+venv\\Scripts\\python.exe voice_transcriber.py
+pause
+""".replace("\n", "\r\n").encode()
+
+LAUNCHER_SH = """#!/bin/bash
+echo "Starting Voice Transcriber..."
+cd "$(dirname "$0")"
+./venv/bin/python voice_transcriber.py
+""".encode()
+
+# Persistent pip cache and wheelhouse, reused across installs
+CACHE_DIR = Path.home() / ".cache" / "wispr-flow-lite"
+
+# pip bootstrap script, cached and refreshed weekly so the pip it installs stays current
+GET_PIP_URL = "https://bootstrap.pypa.io/get-pip.py"
+GET_PIP_MAX_AGE = 7 * 24 * 3600
+
+# Printed by the venv's interpreter to identify which wheels it can use
+VENV_ABI_QUERY = (
+    "import platform, sysconfig; "
+    "print(platform.python_version(), sysconfig.get_platform(), sysconfig.get_config_var('EXT_SUFFIX'))"
+)
+
+def run_command(command):
+    """Run a command (string or argv sequence) and return success status"""
     try:
-        if shell:
-            result = subprocess.run(command, shell=True, capture_output=True, text=True)
-        else:
-            result = subprocess.run(command.split(), capture_output=True, text=True)
+        args = shlex.split(command) if isinstance(command, str) else command
+        result = subprocess.run(args, capture_output=True, text=True)
         
         if result.returncode == 0:
             return True, result.stdout
@@ -37,10 +88,13 @@ def check_python():
 
 def install_system_dependencies():
     """Install system-specific dependencies"""
-    system = platform.system().lower()
-    
-    if system == "darwin":  # macOS
+    if IS_MAC:
         print("🍎 Installing macOS dependencies...")
+        success, _ = run_command(["brew", "list", "portaudio"])
+        if success:
+            print("✅ portaudio already installed")
+            return True
+        
         success, _ = run_command("brew --version")
         if not success:
             print("⚠️  Homebrew not found. Installing portaudio may fail.")
@@ -50,17 +104,25 @@ def install_system_dependencies():
             if success:
                 print("✅ portaudio installed")
     
-    elif system == "linux":
+    elif IS_LINUX:
         print("🐧 Installing Linux dependencies...")
+        # Skip apt (and its sudo prompt) when the packages are already installed
+        success, output = run_command(["dpkg-query", "-W", "-f=${Status}\n", *LINUX_PACKAGES])
+        if success and all(line == "install ok installed" for line in output.splitlines()):
+            print("✅ System dependencies already installed")
+            return True
+        
         # Try apt-get first (Ubuntu/Debian)
-        success, output = run_command("sudo apt-get update && sudo apt-get install -y portaudio19-dev python3-dev", shell=True)
+        success, output = run_command(["sudo", "apt-get", "update"])
+        if success:
+            success, output = run_command(["sudo", "apt-get", "install", "-y", *LINUX_PACKAGES])
         if success:
             print("✅ System dependencies installed")
         else:
             print("⚠️  Could not install dependencies automatically.")
             print("💡 Manual install: sudo apt-get install portaudio19-dev python3-dev")
     
-    elif system == "windows":
+    elif IS_WINDOWS:
         print("🪟 Windows detected - dependencies will be installed via pip")
     
     return True
@@ -69,82 +131,176 @@ def create_virtual_environment():
     """Create virtual environment"""
     print("📦 Creating virtual environment...")
     
-    success, output = run_command("python -m venv venv")
+    # No ensurepip: it unpacks a bundled pip that would need an immediate
+    # upgrade; get-pip.py installs the current pip in one step
+    success, output = run_command("python -m venv --without-pip venv")
     if not success:
         # Try python3 command
-        success, output = run_command("python3 -m venv venv")
+        success, output = run_command("python3 -m venv --without-pip venv")
+    
+    if not success:
+        print(f"❌ Failed to create virtual environment: {output}")
+        return False
+    
+    success, output = install_pip()
+    if not success:
+        # Offline or bootstrap failure: fall back to the bundled pip, which
+        # (unlike get-pip.py's) may be too old and needs upgrading
+        success, output = run_command([*PYTHON_CMD, "-m", "ensurepip"])
+        if success:
+            run_command([*PIP_CMD, "install", "--upgrade", "pip"])
     
     if success:
         print("✅ Virtual environment created")
         return True
     else:
-        print(f"❌ Failed to create virtual environment: {output}")
+        print(f"❌ Failed to install pip into the virtual environment: {output}")
         return False
 
-def install_packages():
+def install_pip():
+    """Install pip into the venv from a cached get-pip.py"""
+    get_pip = CACHE_DIR / "get-pip.py"
+    try:
+        if not get_pip.exists() or time.time() - get_pip.stat().st_mtime > GET_PIP_MAX_AGE:
+            get_pip.parent.mkdir(parents=True, exist_ok=True)
+            partial = get_pip.with_suffix(".part")
+            urllib.request.urlretrieve(GET_PIP_URL, partial)
+            os.replace(partial, get_pip)  # Never cache a truncated download
+    except Exception as e:
+        return False, str(e)
+    return run_command([*PYTHON_CMD, str(get_pip), "--no-setuptools", "--no-wheel"])
+
+def requirements_cache_key(path="requirements.txt"):
+    """Hash requirements.txt and the venv's interpreter so stale wheels are never reused"""
+    digest = hashlib.sha256(Path(path).read_bytes())
+    # The venv may run a different python than this installer, so ask it for
+    # its version, platform and extension ABI (e.g. cpython-311-x86_64-linux-gnu)
+    success, output = run_command([*PYTHON_CMD, "-c", VENV_ABI_QUERY])
+    if not success:
+        output = f"{SYSTEM}-{platform.machine()}-{platform.python_version()}"
+    digest.update(output.strip().encode())
+    return digest.hexdigest()[:16]
+
+def resolve_requirements(wheel_root, cache_dir):
+    """Resolve requirements.txt once into pinned name==version specifiers, or None"""
+    report = wheel_root / "resolution.json"
+    success, _ = run_command([
+        *PIP_CMD, "install", "--dry-run", "--ignore-installed", "--quiet",
+        "--cache-dir", cache_dir, "--report", str(report), "-r", "requirements.txt"
+    ])
+    if not success:
+        return None
+    try:
+        installs = json.loads(report.read_text())["install"]
+        return [f"{item['metadata']['name']}=={item['metadata']['version']}" for item in installs]
+    except (OSError, ValueError, KeyError):
+        return None
+
+def build_wheelhouse(jobs, wheel_root):
+    """Build wheels for the resolved dependency set as concurrent pip processes"""
+    cache_dir = str(CACHE_DIR / "pip")
+    wheel_root.mkdir(parents=True, exist_ok=True)
+    
+    # Resolve the full dependency tree once, then build each pinned package
+    # with --no-deps, so shared dependencies (torch for torchaudio, numpy for
+    # scipy) are fetched and built exactly once instead of per shard
+    pinned = resolve_requirements(wheel_root, cache_dir)
+    if pinned:
+        jobs = max(1, min(jobs, len(pinned)))
+        shards = [["--no-deps", *pinned[i::jobs]] for i in range(jobs)]
+    else:
+        # pip too old for --report: one resolver run over everything
+        jobs = 1
+        shards = [["-r", "requirements.txt"]]
+    
+    # Each shard gets its own directory so two pips never write one at once
+    wheel_dirs = [str(wheel_root / f"shard{i}") for i in range(jobs)]
+    
+    print(f"⬇️  Downloading and building wheels with {jobs} parallel jobs...")
+    errors = []
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        futures = [
+            executor.submit(run_command, [*PIP_CMD, "wheel", "--cache-dir", cache_dir, "-w", dest, *shard])
+            for dest, shard in zip(wheel_dirs, shards)
+        ]
+        for future in as_completed(futures):
+            success, output = future.result()
+            if not success:
+                errors.append(output)
+    
+    if errors:
+        return False, "\n".join(errors)
+    return True, wheel_dirs
+
+def prune_wheelhouses(keep):
+    """Delete wheelhouses for older requirements; each can hold gigabytes of wheels"""
+    for wheelhouse in keep.parent.iterdir():
+        if wheelhouse != keep and wheelhouse.is_dir():
+            shutil.rmtree(wheelhouse, ignore_errors=True)
+
+def install_packages(jobs=DEFAULT_JOBS):
     """Install Python packages"""
     print("📥 Installing Python packages...")
     
-    system = platform.system().lower()
-    if system == "windows":
-        pip_cmd = "venv\\Scripts\\pip"
-        python_cmd = "venv\\Scripts\\python"
+    # Build (or reuse) a wheelhouse keyed on requirements.txt, then install
+    # once from disk; pip itself never runs concurrently against the venv
+    wheel_root = CACHE_DIR / "wheels" / requirements_cache_key()
+    complete_marker = wheel_root / ".complete"
+    if complete_marker.exists():
+        print("♻️  Using cached wheels")
+        success, output = True, sorted(str(d) for d in wheel_root.glob("shard*"))
     else:
-        pip_cmd = "venv/bin/pip"
-        python_cmd = "venv/bin/python"
+        shutil.rmtree(wheel_root, ignore_errors=True)
+        success, output = build_wheelhouse(jobs, wheel_root)
+        if success:
+            complete_marker.touch()
+            prune_wheelhouses(wheel_root)
+        else:
+            shutil.rmtree(wheel_root, ignore_errors=True)
     
-    # Upgrade pip first
-    run_command(f"{pip_cmd} install --upgrade pip")
+    if success:
+        find_links = [arg for d in output for arg in ("--find-links", d)]
+        success, output = run_command([*PIP_CMD, "install", "--no-index", *find_links, "-r", "requirements.txt"])
+    if not success:
+        print(f"⚠️  Wheelhouse install failed, installing from the index: {output}")
+        success, output = run_command([*PIP_CMD, "install", "--cache-dir", str(CACHE_DIR / "pip"), "-r", "requirements.txt"])
     
-    # Install requirements
-    success, output = run_command(f"{pip_cmd} install -r requirements.txt")
     if success:
         print("✅ All packages installed successfully!")
         return True
     else:
         print(f"❌ Package installation failed: {output}")
         print("💡 Try installing packages manually:")
-        print(f"   {pip_cmd} install openai pyaudio keyboard pyautogui pynput python-dotenv tenacity")
+        print(f"   {PIP_CMD[0]} install openai pyaudio keyboard pyautogui pynput python-dotenv tenacity")
         return False
 
+def write_launcher(path, content):
+    """Write a launcher script as executable in a single open/write/close"""
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0), 0o755)
+    try:
+        # The mode above only applies to new files; fchmod covers reruns
+        if hasattr(os, "fchmod"):
+            os.fchmod(fd, 0o755)
+        os.write(fd, content)
+    finally:
+        os.close(fd)
+
 def create_launcher_scripts():
     """Create launcher scripts"""
     print("🚀 Creating launcher scripts...")
     
-    system = platform.system().lower()
-    
-    if system == "windows":
-        # Windows batch file
-        batch_content = """@echo off
-echo Starting Voice Transcriber...
-cd /d "%~dp0"
-venv\\Scripts\\python.exe voice_transcriber.py
-pause
-"""
-        with open("start_transcriber.bat", "w") as f:
-            f.write(batch_content)
+    if IS_WINDOWS:
+        write_launcher("start_transcriber.bat", LAUNCHER_BAT)
         print("✅ Created start_transcriber.bat")
     
     else:
-        # Unix shell script
-        shell_content = """#!/bin/bash
-echo "Starting Voice Transcriber..."
-cd "$(dirname "$0")"
-./venv/bin/python voice_transcriber.py
-"""
-        with open("start_transcriber.sh", "w") as f:
-            f.write(shell_content)
-        
-        # Make executable
-        os.chmod("start_transcriber.sh", 0o755)
+        write_launcher("start_transcriber.sh", LAUNCHER_SH)
         print("✅ Created start_transcriber.sh")
     
     return True
 
 def print_instructions():
     """Print setup instructions"""
-    system = platform.system().lower()
-    
     print("\n" + "="*60)
     print("🎉 Installation Complete!")
     print("="*60)
@@ -155,20 +311,20 @@ def print_instructions():
     
     print("\n2. Edit the .env file and replace 'your-api-key-here' with your actual API key")
     
-    if system == "darwin":
+    if IS_MAC:
         print("\n3. Grant permissions on macOS:")
         print("   System Preferences > Security & Privacy > Privacy")
         print("   • Enable 'Microphone' access")
         print("   • Enable 'Accessibility' access") 
         print("   • Enable 'Input Monitoring' access")
     
-    elif system == "linux":
+    elif IS_LINUX:
         print("\n3. Add your user to audio group:")
         print("   sudo usermod -a -G audio $USER")
         print("   (logout and login again)")
     
     print("\n4. Start the application:")
-    if system == "windows":
+    if IS_WINDOWS:
         print("   Double-click: start_transcriber.bat")
     else:
         print("   Run: ./start_transcriber.sh")
@@ -183,19 +339,30 @@ def print_instructions():
 
 def main():
     """Main installer"""
+    parser = argparse.ArgumentParser(description="Voice Transcriber Installer")
+    parser.add_argument("--jobs", type=int, default=DEFAULT_JOBS,
+                        help=f"parallel pip downloads (default: {DEFAULT_JOBS})")
+    args = parser.parse_args()
+    
     print("🎙️ Voice Transcriber Installer")
     print("="*40)
     
     if not check_python():
         return 1
     
-    if not install_system_dependencies():
-        print("⚠️  Continuing despite system dependency issues...")
-    
-    if not create_virtual_environment():
-        return 1
+    # System packages (brew/apt) and the venv are independent, so run them
+    # side by side; pip only starts once both are done (pyaudio needs portaudio)
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        system_deps = executor.submit(install_system_dependencies)
+        venv = executor.submit(create_virtual_environment)
+        
+        if not system_deps.result():
+            print("⚠️  Continuing despite system dependency issues...")
+        
+        if not venv.result():
+            return 1
     
-    if not install_packages():
+    if not install_packages(args.jobs):
         return 1
     
     if not create_launcher_scripts():
@@ -5,35 +5,38 @@ Quick performance test to compare VAD vs MP3 versions
 
 import os
 import sys
-import time
 import subprocess
+from pathlib import Path
 from dotenv import load_dotenv
 
 load_dotenv()
 
+# Imports the script as a module (its __main__ guard keeps the app from
+# starting) and prints how long the top-level import took
+IMPORT_TIMER = "import time; t = time.perf_counter(); import {module}; print(time.perf_counter() - t)"
+
 def test_version_startup(script_name):
     """Test how long each version takes to start up"""
     print(f"\n🧪 Testing {script_name} startup time...")
     
-    start_time = time.perf_counter()
-    
-    # Start the process and immediately kill it to measure startup time
+    # Time a cold import in a fresh interpreter that exits as soon as the
+    # module has loaded, rather than a fixed sleep before killing the app
+    script = Path(script_name).resolve()
     try:
-        process = subprocess.Popen(
-            [sys.executable, script_name],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True
+        result = subprocess.run(
+            [sys.executable, "-c", IMPORT_TIMER.format(module=script.stem)],
+            cwd=script.parent,
+            capture_output=True,
+            text=True,
+            timeout=30
         )
         
-        # Wait a moment for initialization
-        time.sleep(2)
-        
-        # Kill the process
-        process.terminate()
-        process.wait()
+        if result.returncode != 0:
+            error = result.stderr.strip().splitlines()
+            print(f"   Error testing {script_name}: {error[-1] if error else result.returncode}")
+            return None
         
-        startup_time = time.perf_counter() - start_time
+        startup_time = float(result.stdout.strip().splitlines()[-1])
         print(f"   Startup time: {startup_time:.2f}s")
         return startup_time
         
@@ -73,11 +76,17 @@ def analyze_code_complexity():
     
     for file in files:
         if os.path.exists(file):
+            # One pass over the file, counting as we go
+            total_lines = code_lines = functions = 0
             with open(file, 'r') as f:
-                lines = f.readlines()
-                total_lines = len(lines)
-                code_lines = len([l for l in lines if l.strip() and not l.strip().startswith('#')])
-                functions = len([l for l in lines if l.strip().startswith('def ')])
+                for line in f:
+                    total_lines += 1
+                    stripped = line.strip()
+                    if not stripped or stripped.startswith('#'):
+                        continue
+                    code_lines += 1
+                    if stripped.startswith('def '):
+                        functions += 1
                 
                 print(f"   {file}:")
                 print(f"     Total lines: {total_lines}")
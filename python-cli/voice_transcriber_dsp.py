@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+PCM helpers for the voice transcribers.
+Per-sample math over int16 audio (RMS, peak, silence edges). The kernels are
+JIT-compiled with Numba when it is installed and fall back to vectorised
+NumPy otherwise, so no per-sample work ever runs in the interpreter.
+
+Optional:
+pip install numba
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+
+def _rms_int16_loop(pcm):
+    """Root-mean-square level of an int16 buffer (Numba kernel)"""
+    n = pcm.shape[0]
+    if n == 0:
+        return 0.0
+    total = 0.0
+    for i in range(n):
+        sample = float(pcm[i])
+        total += sample * sample
+    return (total / n) ** 0.5
+
+
+def _peak_int16_loop(pcm):
+    """Largest absolute sample value of an int16 buffer (Numba kernel)"""
+    peak = 0
+    for i in range(pcm.shape[0]):
+        value = abs(int(pcm[i]))
+        if value > peak:
+            peak = value
+    return peak
+
+
+def _silence_edges_loop(pcm, window, threshold):
+    """Sample span from the first to the last window louder than threshold (Numba kernel)"""
+    num_windows = pcm.shape[0] // window
+    limit = threshold * threshold * window  # Compare sums of squares, no sqrt per window
+    first = -1
+    last = -1
+    for w in range(num_windows):
+        total = 0.0
+        for i in range(w * window, (w + 1) * window):
+            sample = float(pcm[i])
+            total += sample * sample
+        if total > limit:
+            if first < 0:
+                first = w
+            last = w
+    if first < 0:
+        return 0, 0
+    return first * window, (last + 1) * window
+
+
+def _rms_int16_numpy(pcm):
+    """Root-mean-square level of an int16 buffer"""
+    if len(pcm) == 0:
+        return 0.0
+    samples = pcm.astype(np.float64)
+    return float(np.sqrt(np.dot(samples, samples) / len(samples)))
+
+
+def _peak_int16_numpy(pcm):
+    """Largest absolute sample value of an int16 buffer"""
+    if len(pcm) == 0:
+        return 0
+    return int(np.abs(pcm.astype(np.int32)).max())
+
+
+def _silence_edges_numpy(pcm, window, threshold):
+    """Sample span from the first to the last window louder than threshold"""
+    num_windows = len(pcm) // window
+    if num_windows == 0:
+        return 0, 0
+    frames = pcm[:num_windows * window].astype(np.float64).reshape(num_windows, window)
+    energy = np.einsum('ij,ij->i', frames, frames)
+    loud = np.flatnonzero(energy > threshold * threshold * window)
+    if len(loud) == 0:
+        return 0, 0
+    return int(loud[0]) * window, (int(loud[-1]) + 1) * window
+
+
+def downsample2_int16(pcm):
+    """Halve the sample rate of an int16 buffer, averaging each pair as the anti-alias filter"""
+    pairs = pcm[:len(pcm) // 2 * 2].reshape(-1, 2).astype(np.int32)
+    return ((pairs[:, 0] + pairs[:, 1]) >> 1).astype(np.int16)
+
+
+if njit is not None:
+    rms_int16 = njit(cache=True, fastmath=True)(_rms_int16_loop)
+    peak_int16 = njit(cache=True)(_peak_int16_loop)
+    silence_edges = njit(cache=True, fastmath=True)(_silence_edges_loop)
+
+    # Compile (or load from the on-disk cache) at import, not on first recording
+    _warmup = np.zeros(320, dtype=np.int16)
+    rms_int16(_warmup)
+    peak_int16(_warmup)
+    silence_edges(_warmup, 160, 1.0)
+    del _warmup
+else:
+    rms_int16 = _rms_int16_numpy
+    peak_int16 = _peak_int16_numpy
+    silence_edges = _silence_edges_numpy
@@ -10,7 +10,7 @@ Features:
 - NO filler word removal (disabled to prevent segfaults)
 
 Requirements:
-pip install requests pyaudio keyboard pyautogui pynput python-dotenv
+pip install requests pyaudio keyboard pyperclip pynput python-dotenv numpy
 """
 
 import os
@@ -19,12 +19,16 @@ import time
 import threading
 import pyaudio
 import requests
-import pyautogui
-import io
-import wave
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import uuid
+import importlib
+import subprocess
+import struct
 from dotenv import load_dotenv
 from pynput import keyboard
 import logging
+from concurrent.futures import Future, ThreadPoolExecutor
 
 # Load environment variables first
 load_dotenv()
@@ -33,6 +37,48 @@ load_dotenv()
 logging.basicConfig(level=logging.ERROR, format='%(message)s')
 logger = logging.getLogger(__name__)
 
+# Seconds between keep-alive pings, under typical server idle timeouts so the
+# pooled TLS connection is still open when a transcription needs it
+KEEPALIVE_INTERVAL = 60
+
+# Streamed uploads: how often the request body checks for newly recorded audio
+STREAM_POLL_SECONDS = 0.02
+
+# Hotkeys: Globe/Fn (where pynput exposes it), Right Command and F13, plus
+# the raw macOS virtual key code for Fn
+GLOBE_KEYS = frozenset(
+    k for k in (getattr(keyboard.Key, 'fn', None), keyboard.Key.cmd_r,
+                getattr(keyboard.Key, 'f13', None)) if k is not None
+)
+GLOBE_VK = 179
+
+# Status codes meaning the endpoint doesn't accept a raw audio/wav body
+RAW_UPLOAD_REJECTED = frozenset({400, 415})
+
+# Recordings shorter than this are accidental taps and never uploaded
+MIN_RECORDING_MS = 200
+
+# Paste shortcut modifier: Cmd on macOS, Ctrl elsewhere
+PASTE_MODIFIER = keyboard.Key.cmd if sys.platform == 'darwin' else keyboard.Key.ctrl
+
+# osascript typing deadline: a fixed allowance plus time per character, so a
+# stuck System Events permission prompt can't hold up later transcripts
+OSASCRIPT_TIMEOUT_SECONDS = 5
+OSASCRIPT_SECONDS_PER_CHAR = 0.02
+
+# Transcripts longer than this are pasted via the clipboard instead of typed
+PASTE_MIN_CHARS = 20
+
+def create_wav_header(num_bytes, sample_rate, channels, sample_width):
+    """Build the 44-byte PCM WAV header for a payload of num_bytes"""
+    block_align = channels * sample_width
+    return struct.pack(
+        '<4sI4s4sIHHIIHH4sI',
+        b'RIFF', 36 + num_bytes, b'WAVE',
+        b'fmt ', 16, 1, channels, sample_rate, sample_rate * block_align, block_align, sample_width * 8,
+        b'data', num_bytes
+    )
+
 def get_input_device():
     """Find available input device"""
     audio = None
@@ -61,31 +107,104 @@ class VoiceTranscriberNoFiller:
         self.api_endpoint = "https://audio-turbo.us-virginia-1.direct.fireworks.ai/v1/audio/transcriptions"
         
         # Audio settings
-        self.chunk = int(os.getenv('CHUNK_SIZE', 2048))
+        self.chunk = int(os.getenv('CHUNK_SIZE', 1024))  # 64ms at 16kHz: less audio waiting on each read
         self.format = pyaudio.paInt16
         self.channels = 1
         self.rate = int(os.getenv('SAMPLE_RATE', 16000))
         self.record_seconds = int(os.getenv('MAX_RECORDING_TIME', 30))
+        self._sample_width = pyaudio.get_sample_size(self.format)
         
         # State
         self.is_recording = False
-        self.audio_frames = []
+        # One buffer sized for the longest allowed recording, filled in place
+        # instead of appending chunks to a list and joining them
+        self._max_bytes = self.rate * self._sample_width * self.channels * self.record_seconds
+        self._pcm = bytearray(self._max_bytes)
+        self._pcm_len = 0
         self.audio = None
+        self._stream = None
         self.globe_pressed = False
+        self._hotkey_released = threading.Event()
+        self._hotkey_released.set()
         
         # Language
         self.language = os.getenv('LANGUAGE', 'en')
         
+        # Streamed upload (opt-in): send audio to the API while still recording
+        self.stream_upload = os.getenv('STREAM_UPLOAD', 'false').lower() == 'true'
+        self._upload_future = None
+        
+        # Raw uploads (opt-in): WAV as the request body, fields in the query string
+        self.raw_upload = os.getenv('RAW_UPLOAD', 'false').lower() == 'true'
+        
+        # Low-bandwidth uploads (opt-in): send mono audio at half the sample rate
+        self.low_bandwidth = os.getenv('LOW_BANDWIDTH', 'false').lower() == 'true'
+        
+        # Recordings quieter than this RMS level (int16 scale) are not transcribed
+        self.skip_rms_threshold = float(os.getenv('VAD_RMS_THRESHOLD', 150))
+        
+        # Clipboard paste: 'auto' (long text only), 'true' (always), 'false' (never)
+        self.paste_mode = os.getenv('PASTE_MODE', 'auto').lower()
+        
+        # Typing speed (seconds between characters)
+        self.typing_interval = float(os.getenv('TYPING_INTERVAL', '0.01'))
+        
+        # Synthetic keystrokes go straight to the OS, without pyautogui's
+        # per-call pause and bookkeeping
+        self._kb = keyboard.Controller()
+        
+        # Encode, upload and type run as pipelined stages on one pool, so a
+        # new recording can start while the previous one is still in flight
+        self._pool = ThreadPoolExecutor(max_workers=3, thread_name_prefix='vt')
+        self._type_future = None
+        self._upload_pool = (
+            ThreadPoolExecutor(max_workers=1, thread_name_prefix='vt-upload')
+            if self.stream_upload else None
+        )
+        # NumPy (and Numba's kernel compile, if installed) load in the
+        # background so the hotkey listener is up sooner
+        self._pool.submit(importlib.import_module, 'voice_transcriber_dsp')
+        
         # Initialize audio
         self._init_audio()
         
-        # HTTP session
+        # HTTP session with a small keep-alive pool: one connection each for
+        # overlapping transcriptions, a streamed upload and the keep-alive ping,
+        # so none of them has to open (and then discard) a fresh TLS connection
         self.session = requests.Session()
+        self.session.mount("https://", HTTPAdapter(
+            pool_connections=2,
+            pool_maxsize=3,
+            max_retries=Retry(total=2, backoff_factor=0.2)
+        ))
         self.session.headers.update({"Authorization": f"Bearer {self.api_key}"})
         
+        # Open the TLS connection now so the first transcription doesn't pay for it
+        self._stop_event = threading.Event()
+        threading.Thread(target=self._keep_connection_warm, daemon=True).start()
+        
+        # Recording state shared with the PortAudio callback; no Python
+        # thread runs while recording
+        self._record_done = threading.Event()
+        self._record_done.set()
+        # Streamed uploads: resolved with the final PCM length when the
+        # recording stops, or cancelled to abort the upload
+        self._stream_end = None
+        
         print("🎙️ Voice Transcriber (Fireworks AI - No Filler Processing)")
         print("🚫 Filler word removal DISABLED for stability testing")
         
+    def _keep_connection_warm(self):
+        """Open the API connection at startup and ping it while idle"""
+        while True:
+            if not self.is_recording:
+                try:
+                    self.session.head(self.api_endpoint, timeout=5)
+                except requests.RequestException as e:
+                    logger.debug(f"Keep-alive ping failed: {e}")
+            if self._stop_event.wait(KEEPALIVE_INTERVAL):
+                return
+    
     def _init_audio(self):
         """Initialize audio system"""
         try:
@@ -93,6 +212,20 @@ class VoiceTranscriberNoFiller:
             self.input_device = get_input_device()
             if self.input_device is None:
                 raise Exception("No input device found")
+            
+            # Opened once and only started/stopped per recording: reopening
+            # costs tens of milliseconds before the first sample on macOS.
+            # Chunks arrive on PortAudio's own thread via _on_audio_chunk
+            self._stream = self.audio.open(
+                format=self.format,
+                channels=self.channels,
+                rate=self.rate,
+                input=True,
+                frames_per_buffer=self.chunk,
+                input_device_index=self.input_device,
+                stream_callback=self._on_audio_chunk,
+                start=False
+            )
         except Exception as e:
             print(f"Audio initialization failed: {e}")
             sys.exit(1)
@@ -104,41 +237,41 @@ class VoiceTranscriberNoFiller:
             
         print("🎤 Recording...")
         self.is_recording = True
-        self.audio_frames = []
-        
-        self.recording_thread = threading.Thread(target=self._record_audio)
-        self.recording_thread.daemon = True
-        self.recording_thread.start()
-    
-    def _record_audio(self):
-        """Record audio in background"""
-        stream = None
+        self._pcm_len = 0
+        if self.stream_upload:
+            # Each streamed recording gets its own buffer: its upload may
+            # still be reading it after the next recording has started
+            self._pcm = bytearray(self._max_bytes)
+            stream_end = Future()
+        self._record_done.clear()
         try:
-            stream = self.audio.open(
-                format=self.format,
-                channels=self.channels,
-                rate=self.rate,
-                input=True,
-                frames_per_buffer=self.chunk,
-                input_device_index=self.input_device
-            )
-            
-            while self.is_recording:
-                try:
-                    data = stream.read(self.chunk, exception_on_overflow=False)
-                    self.audio_frames.append(data)
-                except:
-                    break
-                    
+            self._stream.start_stream()
         except Exception as e:
             print(f"Recording error: {e}")
-        finally:
-            if stream:
-                try:
-                    stream.stop_stream()
-                    stream.close()
-                except:
-                    pass
+            self.is_recording = False
+            self._record_done.set()
+            return
+        
+        if self.stream_upload:
+            self._stream_end = stream_end
+            self._upload_future = self._upload_pool.submit(self._stream_upload, self._pcm, stream_end)
+    
+    def _on_audio_chunk(self, in_data, frame_count, time_info, status_flags):
+        """PortAudio stream callback - copy each chunk into the PCM buffer"""
+        if not self.is_recording:
+            self._record_done.set()
+            return (None, pyaudio.paComplete)
+        
+        # Copy the chunk into the buffer, stopping once it is full
+        start = self._pcm_len
+        end = min(start + len(in_data), self._max_bytes)
+        self._pcm[start:end] = memoryview(in_data)[:end - start]
+        self._pcm_len = end
+        if end >= self._max_bytes:
+            print(f"⏰ Maximum recording time ({self.record_seconds}s) reached")
+            self._record_done.set()
+            return (None, pyaudio.paComplete)
+        return (None, pyaudio.paContinue)
     
     def stop_recording(self):
         """Stop recording and process"""
@@ -148,36 +281,101 @@ class VoiceTranscriberNoFiller:
         self.is_recording = False
         print("⏹️ Processing...")
         
-        # Wait for recording to finish
-        if hasattr(self, 'recording_thread'):
-            self.recording_thread.join(timeout=1.0)
+        # stop_stream() blocks until the callback has returned; the stream
+        # stays open for the next recording
+        try:
+            self._stream.stop_stream()
+        except Exception as e:
+            print(f"Recording error: {e}")
+        self._record_done.set()
+        
+        # Let the streamed upload send the tail and close the body
+        if self._stream_end:
+            self._stream_end.set_result(self._pcm_len)
+            self._stream_end = None
+        
+        # Snapshot the recording (a single memcpy) so the next press can reuse
+        # the buffer without waiting for this recording's stages to run
+        frames_snapshot = bytes(memoryview(self._pcm)[:self._pcm_len])
         
-        # Process audio in separate thread to avoid blocking
-        processing_thread = threading.Thread(target=self._process_audio)
-        processing_thread.daemon = True
-        processing_thread.start()
+        # Hand off to the pipeline: encode -> upload -> type
+        fut_upload, self._upload_future = self._upload_future, None
+        fut_encode = self._pool.submit(self._encode_wav, frames_snapshot)
+        fut_post = self._pool.submit(self._post_audio, fut_encode, fut_upload)
+        self._type_future = self._pool.submit(self._output_text, fut_post, self._type_future)
     
-    def _process_audio(self):
-        """Process recorded audio - NO TEXT PROCESSING"""
-        if not self.audio_frames:
+    def _encode_wav(self, frames):
+        """Pipeline stage: prefix the recorded PCM with a WAV header"""
+        if not frames:
             print("❌ No audio recorded")
-            return
+            return None
+        
+        # Accidental taps and room tone: skip the round trip entirely
+        if self._is_silent(frames):
+            print("🔇 Recording is silent or too short - skipped transcription")
+            return None
+        
+        if self.low_bandwidth and self.channels == 1:
+            import numpy as np
+            from voice_transcriber_dsp import downsample2_int16
             
+            # Half the bytes on the wire, at the cost of everything above rate/4
+            down = downsample2_int16(np.frombuffer(frames, dtype=np.int16))
+            header = create_wav_header(down.nbytes, self.rate // 2, self.channels, self._sample_width)
+            return header + memoryview(down)
+        
+        # One concatenation; no wave.Wave_write object or extra buffer copy
+        header = create_wav_header(len(frames), self.rate, self.channels, self._sample_width)
+        return header + frames
+    
+    def _is_silent(self, frames):
+        """Check whether the recording is too short or too quiet to transcribe"""
+        duration_ms = len(frames) / (self.rate * self._sample_width * self.channels) * 1000
+        if duration_ms < MIN_RECORDING_MS:
+            return True
+        
         try:
-            # Create audio buffer
-            audio_buffer = io.BytesIO()
-            with wave.open(audio_buffer, 'wb') as wf:
-                wf.setnchannels(self.channels)
-                wf.setsampwidth(self.audio.get_sample_size(self.format))
-                wf.setframerate(self.rate)
-                wf.writeframes(b''.join(self.audio_frames))
+            import numpy as np
+            from voice_transcriber_dsp import rms_int16
+        except ImportError as e:
+            # The level check is an optimization; never fail a dictation over it
+            logger.warning(f"Silence check unavailable ({e}); uploading anyway")
+            return False
+        
+        return rms_int16(np.frombuffer(frames, dtype=np.int16)) < self.skip_rms_threshold
+    
+    def _post_audio(self, fut_encode, fut_upload):
+        """Pipeline stage: get the transcript, from the streamed upload if there was one"""
+        try:
+            audio_wav = fut_encode.result()
+            if audio_wav is None:
+                return None
             
-            audio_buffer.seek(0)
-            audio_data = audio_buffer.getvalue()
+            if fut_upload:
+                # Most of the audio is already uploaded; wait for the tail
+                print("🔄 Finishing streamed upload...")
+                text = fut_upload.result()
+                if text is not None:
+                    return text
+                print("⚠️ Streamed upload failed, retrying as a regular upload")
             
-            # Transcribe
+            # Transcribe (the bytes are uploaded as-is, no intermediate copies)
             print("🔄 Transcribing...")
-            text = self._transcribe(audio_data)
+            return self._transcribe(audio_wav)
+            
+        except Exception as e:
+            print(f"Processing error: {e}")
+            import traceback
+            traceback.print_exc()
+            return None
+    
+    def _output_text(self, fut_post, previous):
+        """Pipeline stage: type the transcript - NO TEXT PROCESSING"""
+        try:
+            text = fut_post.result()
+            # Keep transcripts in recording order
+            if previous:
+                previous.result()
             
             if text and text.strip():
                 # CRITICAL: NO TEXT PROCESSING - Direct output only
@@ -186,7 +384,7 @@ class VoiceTranscriberNoFiller:
                 # Type the raw text directly - NO FILLER WORD REMOVAL
                 self._type_text(text.strip())
                 print("✅ Text typed")
-            else:
+            elif text is not None:
                 print("❌ No transcription received")
                 
         except Exception as e:
@@ -194,29 +392,98 @@ class VoiceTranscriberNoFiller:
             import traceback
             traceback.print_exc()
         finally:
-            # Ensure clean state for next recording
-            self.audio_frames = []
+            # The buffer cursor is reset when the next recording starts
             print("🎯 Ready for next recording...")
     
-    def _transcribe(self, audio_data):
-        """Send to Fireworks API"""
+    def _request_fields(self):
+        """Form fields sent alongside the audio file"""
+        data = {
+            'model': 'whisper-v3-turbo',
+            'response_format': 'text'
+        }
+        
+        if self.language != 'auto':
+            data['language'] = self.language
+        return data
+    
+    def _stream_upload(self, pcm, stream_end):
+        """POST the recording as a chunked multipart body; None on failure"""
+        boundary = uuid.uuid4().hex
         try:
-            files = {
-                'file': ('audio.wav', io.BytesIO(audio_data), 'audio/wav')
-            }
+            response = self.session.post(
+                self.api_endpoint,
+                data=self._stream_body(boundary, pcm, stream_end),
+                headers={'Content-Type': f'multipart/form-data; boundary={boundary}'},
+                timeout=30
+            )
             
-            data = {
-                'model': 'whisper-v3-turbo',
-                'response_format': 'text'
-            }
+            if response.status_code == 200:
+                return response.text.strip()
+            print(f"Streamed upload API error: {response.status_code} - {response.text}")
+        except Exception as e:
+            print(f"Streamed upload error: {e}")
+        return None
+    
+    def _stream_body(self, boundary, pcm, stream_end):
+        """Yield the multipart body, following this recording's buffer as it fills"""
+        head = ''.join(
+            f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'
+            for name, value in self._request_fields().items()
+        )
+        head += (f'--{boundary}\r\nContent-Disposition: form-data; name="file"; filename="audio.wav"\r\n'
+                 'Content-Type: audio/wav\r\n\r\n')
+        # The final length isn't known yet, so the WAV header claims the
+        # maximum; decoders stop at the end of the part
+        yield head.encode() + create_wav_header(self._max_bytes, self.rate, self.channels, self._sample_width)
+        
+        sent = 0
+        while True:
+            # Read the cursor before checking for the end: once this recording
+            # has stopped, the cursor may already belong to the next one
+            end = self._pcm_len
+            stopped = stream_end.done()
+            if stopped:
+                # Raises CancelledError (aborting the request) if the
+                # recording was abandoned rather than finished
+                end = stream_end.result()
+            if end > sent:
+                yield bytes(memoryview(pcm)[sent:end])
+                sent = end
+            elif stopped:
+                break
+            else:
+                time.sleep(STREAM_POLL_SECONDS)
+        
+        yield f'\r\n--{boundary}--\r\n'.encode()
+    
+    def _transcribe(self, audio_wav):
+        """Send in-memory WAV bytes to Fireworks API"""
+        try:
+            if self.raw_upload:
+                response = self.session.post(
+                    self.api_endpoint,
+                    params=self._request_fields(),
+                    data=audio_wav,
+                    headers={'Content-Type': 'audio/wav'},
+                    timeout=30
+                )
+                if response.status_code == 200:
+                    return response.text.strip()
+                if response.status_code not in RAW_UPLOAD_REJECTED:
+                    print(f"API error: {response.status_code} - {response.text}")
+                    return None
+                # Endpoint wants multipart; stop trying raw bodies this session
+                print(f"⚠️ Raw upload not supported ({response.status_code}), using multipart")
+                self.raw_upload = False
             
-            if self.language != 'auto':
-                data['language'] = self.language
+            files = {
+                'file': ('audio.wav', audio_wav, 'audio/wav')
+            }
             
             response = self.session.post(
                 self.api_endpoint,
                 files=files,
-                data=data,
+                data=self._request_fields(),
                 timeout=30
             )
             
@@ -233,85 +500,97 @@ class VoiceTranscriberNoFiller:
     def _type_text(self, text):
         """Type the transcribed text - NO PROCESSING"""
         try:
-            time.sleep(0.1)  # Allow key release
+            # Synthetic keys must not mix with a held hotkey; normally it was
+            # released before transcription even started
+            self._hotkey_released.wait(timeout=0.1)
+            
+            # One paste instead of one synthetic keystroke per character
+            if self.paste_mode == 'true' or (self.paste_mode == 'auto' and len(text) > PASTE_MIN_CHARS):
+                try:
+                    self._paste_text(text)
+                    return
+                except Exception as e:
+                    print(f"Clipboard paste failed, typing instead: {e}")
             
-            # Get typing speed
-            interval = float(os.getenv('TYPING_INTERVAL', '0.01'))
+            # macOS: hand the whole string to System Events in one call
+            if sys.platform == 'darwin' and self._keystroke_macos(text):
+                return
             
             # Type raw text directly - NO FILLER WORD PROCESSING
-            pyautogui.typewrite(text, interval=interval)
+            if self.typing_interval > 0:
+                for char in text:
+                    self._kb.type(char)
+                    time.sleep(self.typing_interval)
+            else:
+                self._kb.type(text)
             
         except Exception as e:
             print(f"Typing error: {e}")
             import traceback
             traceback.print_exc()
     
+    def _keystroke_macos(self, text):
+        """Type text with one osascript call; False if it failed"""
+        # AppleScript string literal: only backslashes and quotes need escaping
+        literal = '"' + text.replace('\\', '\\\\').replace('"', '\\"') + '"'
+        try:
+            result = subprocess.run(
+                ['osascript', '-e', f'tell application "System Events" to keystroke {literal}'],
+                capture_output=True, text=True,
+                timeout=OSASCRIPT_TIMEOUT_SECONDS + len(text) * OSASCRIPT_SECONDS_PER_CHAR
+            )
+        except subprocess.TimeoutExpired:
+            print("osascript keystroke timed out (permission prompt?), typing instead")
+            return False
+        if result.returncode != 0:
+            print(f"osascript keystroke failed, typing instead: {result.stderr.strip()}")
+            return False
+        return True
+    
+    def _paste_text(self, text):
+        """Paste text via the clipboard, restoring the previous contents afterwards"""
+        import pyperclip
+        
+        previous = pyperclip.paste()
+        pyperclip.copy(text)
+        with self._kb.pressed(PASTE_MODIFIER):
+            self._kb.press('v')
+            self._kb.release('v')
+        
+        # Restore the user's clipboard once the target app has read it
+        restore_timer = threading.Timer(0.5, pyperclip.copy, args=(previous,))
+        restore_timer.daemon = True
+        restore_timer.start()
+    
+    def _is_globe_key(self, key):
+        """Check whether a key event is the Globe/Fn hotkey or one of its fallbacks"""
+        # Runs on the OS input thread for every keystroke, so hash lookups only
+        return key in GLOBE_KEYS or getattr(key, 'vk', None) == GLOBE_VK
+    
     def on_press(self, key):
         """Handle key press"""
+        if self.globe_pressed or not self._is_globe_key(key):
+            return
         try:
-            # Check for Globe/Fn key - multiple detection methods
-            globe_key_detected = False
-            
-            # Method 1: Direct Fn key detection (if available)
-            if hasattr(keyboard.Key, 'fn') and key == keyboard.Key.fn:
-                globe_key_detected = True
-            
-            # Method 2: String comparison for Fn key
-            elif str(key) == 'Key.fn':
-                globe_key_detected = True
-                
-            # Method 3: Virtual key code for Fn key (macOS specific)
-            elif hasattr(key, 'vk') and key.vk == 179:
-                globe_key_detected = True
-                
-            # Method 4: Right Command key as alternative (more reliable on macOS)
-            elif key == keyboard.Key.cmd_r:
-                globe_key_detected = True
-                
-            # Method 5: F13 key as alternative (often unmapped and available)
-            elif hasattr(key, 'name') and key.name == 'f13':
-                globe_key_detected = True
-            
-            if globe_key_detected and not self.globe_pressed:
-                self.globe_pressed = True
-                print(f"🔴 Key pressed (globe_pressed={self.globe_pressed}, is_recording={self.is_recording})")
-                if not self.is_recording:
-                    self.start_recording()
+            self.globe_pressed = True
+            self._hotkey_released.clear()
+            print(f"🔴 Key pressed (globe_pressed={self.globe_pressed}, is_recording={self.is_recording})")
+            if not self.is_recording:
+                self.start_recording()
                 
         except Exception as e:
             print(f"Key press error: {e}")
     
     def on_release(self, key):
         """Handle key release"""
+        if not self.globe_pressed or not self._is_globe_key(key):
+            return
         try:
-            # Check for Globe key (Fn key) release - multiple detection methods
-            globe_key_released = False
-            
-            # Method 1: Direct Fn key detection (if available)
-            if hasattr(keyboard.Key, 'fn') and key == keyboard.Key.fn:
-                globe_key_released = True
-            
-            # Method 2: String comparison for Fn key
-            elif str(key) == 'Key.fn':
-                globe_key_released = True
-                
-            # Method 3: Virtual key code for Fn key (macOS specific)
-            elif hasattr(key, 'vk') and key.vk == 179:
-                globe_key_released = True
-                
-            # Method 4: Right Command key as alternative (more reliable on macOS)
-            elif key == keyboard.Key.cmd_r:
-                globe_key_released = True
-                
-            # Method 5: F13 key as alternative (often unmapped and available)
-            elif hasattr(key, 'name') and key.name == 'f13':
-                globe_key_released = True
-            
-            if globe_key_released and self.globe_pressed:
-                print(f"🟢 Key released (globe_pressed={self.globe_pressed}, is_recording={self.is_recording})")
-                self.globe_pressed = False
-                if self.is_recording:
-                    self.stop_recording()
+            print(f"🟢 Key released (globe_pressed={self.globe_pressed}, is_recording={self.is_recording})")
+            self.globe_pressed = False
+            self._hotkey_released.set()
+            if self.is_recording:
+                self.stop_recording()
                     
         except Exception as e:
             print(f"Key release error: {e}")
@@ -345,14 +624,27 @@ class VoiceTranscriberNoFiller:
         try:
             self.is_recording = False
             
+            # Abort a streamed upload instead of sending a partial recording
+            if getattr(self, '_stream_end', None):
+                self._stream_end.cancel()
+            
             if hasattr(self, 'keyboard_listener'):
                 self.keyboard_listener.stop()
             
+            if hasattr(self, '_stop_event'):
+                self._stop_event.set()
+            
+            if hasattr(self, '_pool'):
+                self._pool.shutdown(wait=False, cancel_futures=True)
+            if getattr(self, '_upload_pool', None):
+                self._upload_pool.shutdown(wait=False, cancel_futures=True)
+            
             if hasattr(self, 'session'):
                 self.session.close()
             
             if self.audio:
-                time.sleep(0.1)
+                if self._stream:
+                    self._stream.close()  # Aborts the stream if it is still running
                 self.audio.terminate()
                 
         except Exception as e:
@@ -11,21 +11,21 @@ Features:
 - Cross-platform support (Windows, macOS, Linux)
 
 Requirements:
-pip install requests pyaudio keyboard pyautogui pynput python-dotenv
+pip install requests pyaudio keyboard pyautogui pyperclip pynput python-dotenv
 """
 
 import os
 import sys
 import time
 import threading
+from concurrent.futures import ThreadPoolExecutor
 import pyaudio
 import requests
-import pyautogui
+from requests.adapters import HTTPAdapter
 import re
-import tempfile
-import wave
-import io
-from pathlib import Path
+import string
+import struct
+from importlib.util import find_spec
 from dotenv import load_dotenv
 from pynput import keyboard
 import logging
@@ -49,6 +49,54 @@ logger = logging.getLogger(__name__)
 MAX_RETRIES = 3
 RETRY_WAIT_SECONDS = 2
 
+# Pooled connections idle for longer than this may have been closed by the
+# server, so they are re-warmed when a recording starts
+CONNECTION_IDLE_SECONDS = 30
+
+# Transcripts longer than this are pasted via the clipboard instead of typed
+PASTE_MIN_CHARS = 20
+
+# Size of the PCM WAV header the recording buffer reserves in front of the audio
+WAV_HEADER_BYTES = 44
+
+# Silence trimming (TRIM_SILENCE): analysis window, level that counts as
+# speech (int16 RMS) and the guard band kept around the speech
+TRIM_FRAME_MS = 20
+TRIM_RMS_THRESHOLD = 300.0
+TRIM_GUARD_MS = 100
+
+# Substrings that mean the spacing pass has work to do; Whisper output
+# usually has none of them, so the regex pass can be skipped
+SPACING_ARTIFACTS = ('  ', ' .', ' !', ' ?', ' ,', ' :', ' ;', '\t', '\n', '\r', '\x0b', '\x0c')
+
+# Punctuation mapped to spaces before splitting text into words for the filler
+# pre-check, so "um," and "like..." still count as words
+WORD_SEPARATORS = str.maketrans({c: ' ' for c in string.punctuation + '…—–“”‘’'})
+
+def _needs_spacing_fix(text):
+    """Cheap substring pre-check before running the spacing regex"""
+    return any(artifact in text for artifact in SPACING_ARTIFACTS)
+
+def create_wav_header(num_bytes, sample_rate, channels, sample_width):
+    """Build the 44-byte PCM WAV header for a payload of num_bytes"""
+    block_align = channels * sample_width
+    return struct.pack(
+        '<4sI4s4sIHHIIHH4sI',
+        b'RIFF', 36 + num_bytes, b'WAVE',
+        b'fmt ', 16, 1, channels, sample_rate, sample_rate * block_align, block_align, sample_width * 8,
+        b'data', num_bytes
+    )
+
+def _upper_match(match):
+    """Regex replacement callback that upper-cases the matched text"""
+    return match.group(0).upper()
+
+def _spacing_replacement(match):
+    """Regex replacement callback for the text cleanup alternation"""
+    # Whitespace runs collapse to one space; fillers and space before
+    # punctuation are dropped
+    return ' ' if match.lastgroup == 'ws' else ''
+
 def get_input_device():
     """Find the best available input device"""
     audio = None
@@ -93,18 +141,49 @@ class VoiceTranscriber:
         
         # Create persistent HTTP session for connection pooling
         self.session = requests.Session()
+        self.session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=2))
         self.session.headers.update({"Authorization": f"Bearer {self.api_key}"})
         
+        # Open the TLS connection now so the first transcription doesn't pay for it
+        self._last_request_time = 0.0
+        threading.Thread(target=self._warm_connection, daemon=True).start()
+        
         # Audio recording settings (optimized for speed)
         self.chunk = int(os.getenv('CHUNK_SIZE', 4096))  # Larger chunks for efficiency
         self.format = pyaudio.paInt16
+        self._sample_width = pyaudio.get_sample_size(self.format)  # Constant for the process lifetime
         self.channels = 1
         self.rate = int(os.getenv('SAMPLE_RATE', 16000))  # Whisper's native sample rate
         self.record_seconds = int(os.getenv('MAX_RECORDING_TIME', 30))
+        self.max_memory_mb = float(os.getenv('MAX_MEMORY_MB', 100))  # Default 100MB limit
+        self.typing_interval = float(os.getenv('TYPING_INTERVAL', 0.005))
+        # Clipboard paste: 'auto' (long or non-ASCII text), 'true' (always), 'false' (never)
+        self.paste_mode = os.getenv('PASTE_MODE', 'auto').lower()
+        # Drop leading/trailing silence before upload (needs numpy)
+        self.trim_silence = os.getenv('TRIM_SILENCE', 'false').lower() == 'true'
         
         # Recording state
         self.is_recording = False
-        self.audio_frames = []
+        # One buffer for the longest allowed recording (plus a chunk of slack
+        # for the wall-clock limit), filled in place with room for the WAV
+        # header in front, instead of a list of chunks joined at the end
+        frame_bytes = self._sample_width * self.channels
+        capacity = min((self.rate * self.record_seconds + self.chunk) * frame_bytes,
+                       int(self.max_memory_mb * 1024 * 1024))
+        self._rec_buf = bytearray(WAV_HEADER_BYTES + capacity)
+        self._rec_mv = memoryview(self._rec_buf)
+        self._rec_end = len(self._rec_buf)
+        self._rec_len = 0  # PCM bytes recorded so far
+        self._record_done = threading.Event()  # Set whenever no recording thread is running
+        self._record_done.set()
+        # Set by stop_recording; the watch loop sleeps on it, so a release is
+        # noticed immediately rather than at the next poll
+        self._stop_requested = threading.Event()
+        # Long-lived workers for recording and processing instead of a new
+        # thread per keypress; one processing worker also keeps transcripts
+        # typed in the order they were spoken
+        self._record_exec = ThreadPoolExecutor(max_workers=1)
+        self._proc_exec = ThreadPoolExecutor(max_workers=1)
         self.audio = None
         self.stream = None
         self.temp_files = set()  # Track temporary files
@@ -119,10 +198,20 @@ class VoiceTranscriber:
         # Language setting
         self.language = os.getenv('LANGUAGE', 'en')
         
+        # Form fields sent with every transcription, built once
+        self._request_data = {
+            "model": "whisper-v3-turbo",
+            "temperature": "0",
+            "vad_model": "silero"
+        }
+        if self.language != 'auto':
+            self._request_data["language"] = self.language
+        
         # Keyboard listener
         self.keyboard_listener = None
         
         # Filler words to remove
+        self._remove_fillers = os.getenv('REMOVE_FILLER_WORDS', 'true').lower() == 'true'
         self.filler_words = {
             'um', 'uh', 'er', 'ah', 'like', 'you know', 'so', 'well',
             'hmm', 'okay', 'right', 'actually', 'basically', 'literally',
@@ -144,24 +233,46 @@ class VoiceTranscriber:
         logger.info(f"⏱️ Max recording time: {self.record_seconds}s")
         logger.info(f"🚀 Using Fireworks AI Whisper Turbo model")
 
+    def _warm_connection(self):
+        """Pre-open the pooled connection to the API endpoint"""
+        self._last_request_time = time.perf_counter()
+        try:
+            self.session.head(self.api_endpoint, timeout=3)
+        except requests.RequestException as e:
+            logger.debug(f"Connection warm-up failed: {e}")
+
     def _compile_text_patterns(self):
         """Pre-compile regex patterns for faster text processing"""
-        # Create regex pattern for filler word removal
-        if self.filler_words:
+        # Whitespace collapse and space-before-punctuation as one alternation
+        spacing = r'(?P<sp>\s+(?=[.!?,:;]))|(?P<ws>\s+)'
+        self.spacing_pattern = re.compile(spacing)
+        
+        # Filler removal joins the same single pass. Each filler takes its
+        # leading whitespace with it, so removing one never leaves a double
+        # space or a space before punctuation behind
+        # The pattern is case-insensitive, so case variants and blank custom
+        # entries (which would match everywhere) only bloat the alternation
+        fillers = {filler.lower() for filler in self.filler_words if filler.strip()}
+        if fillers:
             # Sort by length (longest first) to handle multi-word fillers
-            sorted_fillers = sorted(self.filler_words, key=len, reverse=True)
+            sorted_fillers = sorted(fillers, key=len, reverse=True)
             # Escape special regex characters and create word boundaries
             escaped_fillers = [re.escape(filler) for filler in sorted_fillers]
-            pattern = r'\b(?:' + '|'.join(escaped_fillers) + r')\b'
-            self.filler_pattern = re.compile(pattern, re.IGNORECASE)
+            fill = r'(?P<fill>\s*\b(?:' + '|'.join(escaped_fillers) + r')\b)'
+            self.cleanup_pattern = re.compile(fill + '|' + spacing, re.IGNORECASE)
+            
+            # First word of every filler: text sharing none of them has no
+            # fillers, which a set lookup can tell without the regex
+            first_words = [filler.translate(WORD_SEPARATORS).split()[:1] for filler in fillers]
+            if all(first_words):
+                self._filler_first_words = frozenset(words[0] for words in first_words)
+            else:
+                self._filler_first_words = None  # A punctuation-only filler; always use the regex
         else:
-            self.filler_pattern = None
+            self.cleanup_pattern = None
             
-        # Pre-compile other patterns for grammar improvement
-        self.multiple_spaces_pattern = re.compile(r'\s+')
-        self.space_before_punct_pattern = re.compile(r'\s+([.!?,:;])')
-        self.period_capitalize_pattern = re.compile(r'(\. )([a-z])')
-        self.i_word_pattern = re.compile(r'\bi\b')
+        # Sentence starts and a standalone 'i' are both simply upper-cased
+        self.capitalize_pattern = re.compile(r'(?<=\. )[a-z]|\bi\b')
 
     def _initialize_audio(self):
         """Initialize PyAudio with retry logic"""
@@ -233,107 +344,96 @@ class VoiceTranscriber:
         if not text:
             return ""
             
-        # Remove filler words if enabled (using pre-compiled regex)
-        remove_fillers = os.getenv('REMOVE_FILLER_WORDS', 'true').lower() == 'true'
-        if remove_fillers and self.filler_pattern:
-            text = self.filler_pattern.sub('', text)
+        # Filler removal and spacing fixes in one pre-compiled regex pass,
+        # unless no word in the text can start a filler
+        if self._remove_fillers and self.cleanup_pattern and (
+                self._filler_first_words is None
+                or not self._filler_first_words.isdisjoint(text.lower().translate(WORD_SEPARATORS).split())):
+            text = self.cleanup_pattern.sub(_spacing_replacement, text)
+        elif _needs_spacing_fix(text):
+            text = self.spacing_pattern.sub(_spacing_replacement, text)
         
-        # Basic grammar improvements using pre-compiled patterns
-        text = self.improve_grammar(text)
-        
-        return text
+        return self._capitalize(text)
     
     def improve_grammar(self, text):
         """Basic grammar improvements (optimized with pre-compiled patterns)"""
         if not text:
             return ""
             
-        # Fix common spacing issues using pre-compiled patterns
-        text = self.multiple_spaces_pattern.sub(' ', text)  # Multiple spaces to single space
-        text = self.space_before_punct_pattern.sub(r'\1', text)  # Remove space before punctuation
-        
-        # Capitalize after periods using pre-compiled pattern
-        text = self.period_capitalize_pattern.sub(lambda m: m.group(1) + m.group(2).upper(), text)
-        
-        # Capitalize 'I' using pre-compiled pattern
-        text = self.i_word_pattern.sub('I', text)
+        # Fix common spacing issues in one pass, if there are any
+        if _needs_spacing_fix(text):
+            text = self.spacing_pattern.sub(_spacing_replacement, text)
         
-        # Capitalize first letter
-        text = text[0].upper() + text[1:] if len(text) > 1 else text.upper()
-        
-        return text.strip()
+        return self._capitalize(text)
+    
+    def _capitalize(self, text):
+        """Capitalize the first letter, sentence starts and 'I'"""
+        text = text.strip()
+        text = text[:1].upper() + text[1:]
+        return self.capitalize_pattern.sub(_upper_match, text)
     
     def start_recording(self):
         """Start recording audio"""
-        # Start recording in a separate thread
-        recording_thread = threading.Thread(target=self._record_audio)
-        recording_thread.daemon = True
-        recording_thread.start()
+        # Recording state changes on the caller's thread, so a release that
+        # arrives before the recorder runs still stops it, and the buffer
+        # never holds the previous clip once this press is under way
+        self.is_recording = True
+        self._rec_len = 0
+        self._record_done.clear()
+        self._stop_requested.clear()
+        
+        # Reconnect while the user is still speaking rather than after release
+        if time.perf_counter() - self._last_request_time > CONNECTION_IDLE_SECONDS:
+            threading.Thread(target=self._warm_connection, daemon=True).start()
+        
+        self._record_exec.submit(self._record_audio)
 
     def _record_audio(self):
         """Internal method to handle the actual recording"""
         try:
+            # The key may already have been released
+            if self._stop_requested.is_set():
+                return
+            
             # Clean up any existing stream first
             self._cleanup_stream()
 
+            # Chunks are delivered to _on_audio_chunk on PortAudio's own
+            # thread; start_recording has already reset the buffer
             self.stream = self.audio.open(
                 format=self.format,
                 channels=self.channels,
                 rate=self.rate,
                 input=True,
                 input_device_index=self.input_device_index,
-                frames_per_buffer=self.chunk
+                frames_per_buffer=self.chunk,
+                stream_callback=self._on_audio_chunk
             )
             
-            self.is_recording = True
-            self.audio_frames = []
             self.recording_start_time = time.perf_counter()  # Track recording start time
             
             logger.info("🎤 Recording... Release Globe/Fn key when done.")
             
-            start_time = time.time()
-            last_device_check = time.time()
-            estimated_memory = 0
-            max_memory_mb = float(os.getenv('MAX_MEMORY_MB', 100))  # Default 100MB limit
+            deadline = self.recording_start_time + self.record_seconds
+            # Bound once rather than looked up on every pass of the loop
+            wait_for_stop = self._stop_requested.wait
+            is_active = self.stream.is_active
+            now = time.perf_counter
             
-            # Record in chunks
-            while self.is_recording:
-                try:
-                    # Periodic device check (every 2 seconds)
-                    current_time = time.time()
-                    if current_time - last_device_check > 2:
-                        if not self._check_device_available():
-                            logger.error("❌ Audio device became unavailable")
-                            break
-                        last_device_check = current_time
-
-                    # Check if stream is still active
-                    if not self.stream.is_active():
+            # Watch for stop conditions while the callback captures audio
+            while not wait_for_stop(timeout=0.05):
+                # The stream goes inactive when the buffer is full or the
+                # device disappears, so no separate device poll is needed
+                if not is_active():
+                    if WAV_HEADER_BYTES + self._rec_len >= self._rec_end:
+                        logger.warning(f"⚠️ Recording buffer full ({self.record_seconds}s / {self.max_memory_mb}MB limit)")
+                    else:
                         logger.error("❌ Audio stream became inactive")
-                        break
-
-                    # Read audio data
-                    data = self.stream.read(self.chunk, exception_on_overflow=False)
-                    self.audio_frames.append(data)
-                    
-                    # Estimate memory usage (2 bytes per sample)
-                    chunk_memory = len(data)
-                    estimated_memory += chunk_memory
-                    if estimated_memory > max_memory_mb * 1024 * 1024:
-                        logger.warning(f"⚠️ Memory limit reached ({max_memory_mb}MB)")
-                        break
-                    
-                    # Check for maximum recording time
-                    if time.time() - start_time > self.record_seconds:
-                        logger.info(f"⏰ Maximum recording time ({self.record_seconds}s) reached")
-                        break
-                        
-                except Exception as e:
-                    logger.error(f"Error reading audio: {e}")
-                    # Try to recover from transient errors
-                    if "Input overflowed" in str(e):
-                        logger.warning("⚠️ Input overflow detected, continuing recording")
-                        continue
+                    break
+                
+                # Check for maximum recording time
+                if now() > deadline:
+                    logger.info(f"⏰ Maximum recording time ({self.record_seconds}s) reached")
                     break
                 
         except Exception as e:
@@ -344,24 +444,28 @@ class VoiceTranscriber:
                 logger.info("💡 Check your microphone connection and permissions")
         finally:
             self._cleanup_stream()
-
-    def _check_device_available(self):
-        """Check if the audio device is still available"""
-        try:
-            audio = pyaudio.PyAudio()
-            device_info = audio.get_device_info_by_index(self.input_device_index)
-            audio.terminate()
-            return device_info['maxInputChannels'] > 0
-        except:
-            return False
+            self._record_done.set()
+
+    def _on_audio_chunk(self, in_data, frame_count, time_info, status_flags):
+        """PortAudio stream callback - copy each chunk into the recording buffer"""
+        # Input overflows are reported in status_flags; PortAudio has already
+        # dropped the lost frames, so recording simply continues
+        start = WAV_HEADER_BYTES + self._rec_len
+        buf_end = self._rec_end
+        end = min(start + len(in_data), buf_end)
+        self._rec_mv[start:end] = memoryview(in_data)[:end - start]
+        self._rec_len = end - WAV_HEADER_BYTES
+        if end == buf_end:
+            return (None, pyaudio.paComplete)
+        return (None, pyaudio.paContinue)
 
     def _cleanup_stream(self):
         """Clean up the audio stream with proper error handling"""
         if hasattr(self, 'stream') and self.stream:
             try:
+                # stop_stream() blocks until the callback has returned
                 if self.stream.is_active():
                     self.stream.stop_stream()
-                time.sleep(0.1)  # Give time for the stream to fully stop
                 self.stream.close()
             except Exception as e:
                 logger.debug(f"Error during stream cleanup: {e}")
@@ -374,42 +478,46 @@ class VoiceTranscriber:
         
         # Set flag first to stop recording loop
         self.is_recording = False
+        self._stop_requested.set()
         
-        # Give time for recording loop to finish
-        time.sleep(0.2)
+        # Wait for the recording loop to notice and exit; until it has, the
+        # buffer can't be trusted, so don't process it
+        if not self._record_done.wait(timeout=1.0):
+            logger.warning("⚠️ Recording did not stop in time - skipped transcription")
+            return
         
         # Clean up stream
         self._cleanup_stream()
 
-        if not self.audio_frames:
+        if not self._rec_len:
             logger.warning("⚠️ No audio data recorded")
             return
 
         # Calculate recording duration and data size
         if hasattr(self, 'recording_start_time'):
             recording_duration = stop_time - self.recording_start_time
-            audio_size = sum(len(frame) for frame in self.audio_frames)
-            logger.info(f"📊 Recording stats: {recording_duration:.1f}s duration, {audio_size} bytes, {len(self.audio_frames)} chunks")
+            logger.info(f"📊 Recording stats: {recording_duration:.1f}s duration, {self._rec_len} bytes")
 
-        # Process the recording in a separate thread
-        processing_thread = threading.Thread(target=self._process_audio)
-        processing_thread.daemon = True
-        processing_thread.start()
+        # Snapshot the recording now: the next keypress refills the buffer
+        # while this job may still be queued behind an earlier upload
+        recording = self.create_audio_buffer()
+        if not recording:
+            logger.error("❌ Failed to create audio buffer")
+            return
+        
+        # Process the recording off the keyboard listener thread
+        self._proc_exec.submit(self._process_audio, recording)
 
-    def _process_audio(self):
-        """Process the recorded audio with detailed timing"""
+    def _process_audio(self, recording):
+        """Process a recorded WAV snapshot with detailed timing"""
         process_start = time.perf_counter()
         try:
-            # Create in-memory audio buffer
+            # Trim silence from the snapshot if enabled
             buffer_start = time.perf_counter()
-            audio_data = self.create_audio_buffer()
+            audio_data = self._trim_wav(recording) if self.trim_silence else recording
             buffer_time = (time.perf_counter() - buffer_start) * 1000
             
-            if not audio_data:
-                logger.error("❌ Failed to create audio buffer")
-                return
-
-            logger.info(f"📊 Audio buffer created in {buffer_time:.1f}ms")
+            logger.info(f"📊 Audio buffer prepared in {buffer_time:.1f}ms")
 
             # Transcribe audio
             transcribe_start = time.perf_counter()
@@ -457,17 +565,13 @@ class VoiceTranscriber:
             try:
                 # Measure API call time
                 api_start = time.perf_counter()
+                self._last_request_time = api_start
                 
                 # Use in-memory audio data directly with persistent session
                 response = self.session.post(
                     self.api_endpoint,
-                    files={"file": ("audio.wav", io.BytesIO(audio_data), "audio/wav")},
-                    data={
-                        "model": "whisper-v3-turbo",
-                        "temperature": "0",
-                        "vad_model": "silero",
-                        "language": self.language if self.language != 'auto' else None
-                    }
+                    files={"file": ("audio.wav", audio_data, "audio/wav")},
+                    data=self._request_data
                 )
                 
                 api_time = (time.perf_counter() - api_start) * 1000
@@ -505,43 +609,88 @@ class VoiceTranscriber:
         return None
     
     def create_audio_buffer(self):
-        """Create in-memory audio buffer instead of temporary file"""
-        if not self.audio_frames:
+        """Create an in-memory WAV file from the recording buffer"""
+        if not self._rec_len:
             return None
 
         try:
-            # Create in-memory WAV file
-            audio_buffer = io.BytesIO()
-            
-            with wave.open(audio_buffer, 'wb') as wf:
-                wf.setnchannels(self.channels)
-                wf.setsampwidth(self.audio.get_sample_size(self.format))
-                wf.setframerate(self.rate)
-                wf.writeframes(b''.join(self.audio_frames))
-            
-            # Get the WAV data as bytes
-            audio_buffer.seek(0)
-            return audio_buffer.getvalue()
+            # The header goes into the space reserved in front of the audio;
+            # the returned copy stays valid while the next recording fills the buffer
+            self._rec_mv[:WAV_HEADER_BYTES] = create_wav_header(
+                self._rec_len, self.rate, self.channels, self._sample_width)
+            return self._rec_mv[:WAV_HEADER_BYTES + self._rec_len].tobytes()
         except Exception as e:
             logger.error(f"Error creating audio buffer: {e}")
             return None
     
+    def _trim_wav(self, wav_data):
+        """Return the WAV snapshot with leading/trailing silence trimmed"""
+        pcm = self._trim_silence(memoryview(wav_data)[WAV_HEADER_BYTES:])
+        if len(pcm) == len(wav_data) - WAV_HEADER_BYTES:
+            return wav_data
+        return create_wav_header(len(pcm), self.rate, self.channels, self._sample_width) + pcm
+    
+    def _trim_silence(self, pcm_bytes):
+        """Trim leading/trailing silence from raw PCM, keeping a guard band around speech"""
+        # Deferred import: numpy (and Numba, if installed) only load when trimming is enabled
+        import numpy as np
+        from voice_transcriber_dsp import silence_edges
+        
+        # Window and guard sizes count interleaved samples
+        pcm = np.frombuffer(pcm_bytes, dtype=np.int16)
+        frame = self.rate * TRIM_FRAME_MS // 1000 * self.channels
+        voiced_start, voiced_end = silence_edges(pcm, frame, TRIM_RMS_THRESHOLD)
+        if voiced_end <= voiced_start:
+            return pcm_bytes  # No speech detected; leave the clip untouched
+        
+        guard = self.rate * TRIM_GUARD_MS // 1000 * self.channels
+        start = max(0, voiced_start - guard)
+        end = min(len(pcm), voiced_end + guard)
+        if end - start < len(pcm):
+            trimmed_ms = (len(pcm) - (end - start)) // self.channels * 1000 // self.rate
+            logger.info(f"✂️ Trimmed {trimmed_ms}ms of silence before upload")
+        return pcm[start:end].tobytes()
+    
     def type_text(self, text):
         """Type the transcribed text at the current cursor position (optimized)"""
         try:
+            # Deferred import: pyautogui probes the display server on import
+            import pyautogui
+            
             # Reduced delay for faster response
             time.sleep(0.02)
             
-            # Get typing interval from config (faster default)
-            interval = float(os.getenv('TYPING_INTERVAL', 0.005))
+            # One paste instead of one synthetic keystroke per character;
+            # pyautogui.write also can't type non-ASCII characters at all
+            if self.paste_mode == 'true' or (self.paste_mode == 'auto' and (
+                    len(text) > PASTE_MIN_CHARS or not text.isascii())):
+                try:
+                    self._paste_text(text, pyautogui)
+                    return
+                except Exception as e:
+                    logger.warning(f"⚠️ Clipboard paste failed, typing instead: {e}")
             
             # Type the text
-            pyautogui.write(text, interval=interval)
+            pyautogui.write(text, interval=self.typing_interval)
             
         except Exception as e:
             print(f"❌ Error typing text: {e}")
             print("💡 Make sure to click in a text field before recording")
     
+    def _paste_text(self, text, pyautogui):
+        """Paste text via the clipboard, restoring the previous contents afterwards"""
+        import pyperclip
+        
+        previous = pyperclip.paste()
+        pyperclip.copy(text)
+        modifier = 'command' if sys.platform == 'darwin' else 'ctrl'
+        pyautogui.hotkey(modifier, 'v')
+        
+        # Restore the user's clipboard once the target app has read it
+        restore_timer = threading.Timer(0.5, pyperclip.copy, args=(previous,))
+        restore_timer.daemon = True
+        restore_timer.start()
+    
     def on_press(self, key):
         """Handle key press events"""
         try:
@@ -662,7 +811,8 @@ class VoiceTranscriber:
             # Stop recording if still active
             if self.is_recording:
                 self.is_recording = False
-                time.sleep(0.2)  # Give recording thread time to stop
+                self._stop_requested.set()
+                self._record_done.wait(timeout=1.0)  # Let the recording thread stop
 
             # Clean up keyboard listener
             if hasattr(self, 'keyboard_listener') and self.keyboard_listener:
@@ -674,6 +824,11 @@ class VoiceTranscriber:
             # Clean up audio resources
             self._cleanup_stream()
             
+            # Release the worker threads without waiting on an in-flight request
+            if hasattr(self, '_proc_exec'):
+                self._record_exec.shutdown(wait=False)
+                self._proc_exec.shutdown(wait=False)
+            
             if hasattr(self, 'audio') and self.audio:
                 try:
                     self.audio.terminate()
@@ -714,9 +869,8 @@ def check_dependencies():
     missing = []
     
     for package in required:
-        try:
-            __import__(package)
-        except ImportError:
+        # find_spec only locates the package; it does not import it
+        if find_spec(package) is None:
             missing.append(package)
     
     if missing:
@@ -12,36 +12,99 @@ Features:
 - Cross-platform support (Windows, macOS, Linux)
 
 Requirements:
-pip install openai pyaudio keyboard pyautogui pynput python-dotenv
+pip install openai pyaudio numpy keyboard pyautogui pyperclip pynput python-dotenv
+Optional: pip install soundfile (Opus-compressed uploads for longer clips)
+Optional: pip install webrtcvad (trims leading/trailing silence before upload)
+Optional: pip install faster-whisper (WHISPER_BACKEND=local: offline int8 transcription)
 """
 
 import os
 import sys
+import math
 import time
 import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property
+import numpy as np
 import pyaudio
-from openai import OpenAI
-import pyautogui
 import re
-import tempfile
+import io
 import wave
 from pathlib import Path
 from dotenv import load_dotenv
 from pynput import keyboard
 import logging
+import importlib
+from importlib.util import find_spec
 from tenacity import retry, stop_after_attempt, wait_exponential
 
+try:
+    import soundfile  # Optional: Opus encoding for smaller uploads
+except ImportError:
+    soundfile = None
+
+try:
+    import webrtcvad  # Optional: silence trimming before upload
+except ImportError:
+    webrtcvad = None
+
 # Configure logging
 logging.basicConfig(level=logging.INFO,
                    format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-# Load environment variables
-load_dotenv()
-
 MAX_RETRIES = 3
 RETRY_WAIT_SECONDS = 2
 
+# Clips shorter than this are sent as WAV: encoding them costs more than
+# the upload time it saves
+OPUS_MIN_SECONDS = 5
+
+# faster-whisper takes raw float32 samples at this rate
+WHISPER_SAMPLE_RATE = 16000
+
+# Streaming mode: recordings are cut into segments of this length and each
+# one is uploaded while capture continues
+SEGMENT_SECONDS = 5
+SEGMENT_WORKERS = 4
+
+# Silence trimming: WebRTC VAD frame length and speech guard band
+VAD_FRAME_MS = 20
+VAD_GUARD_MS = 100
+SILENCE_RMS_THRESHOLD = 300.0  # Energy gate used when webrtcvad is not installed
+
+# Hotkeys: Globe/Fn (where pynput exposes it), Right Command and F13, plus
+# the raw macOS virtual key code for Fn
+GLOBE_KEYS = frozenset(
+    k for k in (getattr(keyboard.Key, 'fn', None), keyboard.Key.cmd_r,
+                getattr(keyboard.Key, 'f13', None)) if k is not None
+)
+GLOBE_VK = 179
+
+# Transcripts longer than this are pasted via the clipboard instead of typed
+PASTE_MIN_CHARS = 20
+
+# Runs of fillers that open a sentence ("So, ...", "Um. I mean ..."), stripped
+# together with the punctuation/comma/space after them; a filler must end
+# the token, so hyphenated openers like "Well-known" are left alone
+LEADING_FILLERS = ('so', 'basically', 'i mean', 'well', 'you know', 'um', 'uh')
+LEADING_FILLER_PATTERN = re.compile(
+    r'(^|[.!?]\s+)(?:(?:' + '|'.join(map(re.escape, sorted(LEADING_FILLERS, key=len, reverse=True))) + r')(?=[.!?…,\s]|$)[.!?…]*[,\s]*)+',
+    re.IGNORECASE
+)
+# Punctuation a removed filler can leave at the very start of the text
+STRAY_LEADING_PUNCTUATION = '.!?,;:… '
+
+# Grammar clean-up patterns, compiled once at import
+MULTIPLE_SPACES_PATTERN = re.compile(r'\s+')
+SPACE_BEFORE_PUNCT_PATTERN = re.compile(r'\s+([.!?,:;])')
+SENTENCE_START_PATTERN = re.compile(r'(?<=\. )[a-z]')
+I_WORD_PATTERN = re.compile(r'\bi\b')
+
+def _upper_match(match):
+    """Regex replacement callback that upper-cases the matched text"""
+    return match.group(0).upper()
+
 def get_input_device():
     """Find the best available input device"""
     audio = None
@@ -73,32 +136,81 @@ def get_input_device():
 
 class VoiceTranscriber:
     def __init__(self):
-        # Initialize OpenAI client
+        # Transcription backend: the OpenAI Whisper API, or a local
+        # faster-whisper model (the API stays as fallback when a key is set)
+        self.backend = os.getenv('WHISPER_BACKEND', 'openai').lower()
+        self._local_model = self._load_local_model() if self.backend == 'local' else None
+        
+        # OpenAI API key (the client itself is built lazily, see `client`)
         api_key = os.getenv('OPENAI_API_KEY')
         if not api_key or api_key == 'your-api-key-here':
-            logger.error("❌ OpenAI API key not found!")
-            print("Please set your API key in the .env file:")
-            print("OPENAI_API_KEY=your-actual-api-key-here")
-            sys.exit(1)
-            
-        self.client = OpenAI(api_key=api_key)
+            if self._local_model is None:
+                logger.error("❌ OpenAI API key not found!")
+                print("Please set your API key in the .env file:")
+                print("OPENAI_API_KEY=your-actual-api-key-here")
+                sys.exit(1)
+            api_key = None
+        self._api_key = api_key
+        self._backend_label = "local Whisper" if self._local_model is not None else "OpenAI"
         
         # Audio recording settings
-        self.chunk = int(os.getenv('CHUNK_SIZE', 2048))
+        chunk_size = os.getenv('CHUNK_SIZE')
+        self.auto_chunk_size = not chunk_size  # Autotune from the input device when unset
+        self.chunk = int(chunk_size) if chunk_size else 2048
         self.format = pyaudio.paInt16
+        self._sample_width = pyaudio.get_sample_size(self.format)  # Constant for the process lifetime
         self.channels = 1
         self.rate = int(os.getenv('SAMPLE_RATE', 16000))
         self.record_seconds = int(os.getenv('MAX_RECORDING_TIME', 30))
+        self.max_memory_mb = float(os.getenv('MAX_MEMORY_MB', 100))  # Default 100MB limit
+        self._max_memory_bytes = int(self.max_memory_mb * 1024 * 1024)
+        self.typing_interval = float(os.getenv('TYPING_INTERVAL', 0.01))
+        # Upload codec: 'auto' (Opus for long clips), 'opus' (always), 'wav' (never compress)
+        self.audio_codec = os.getenv('AUDIO_CODEC', 'auto').lower()
+        # Clipboard paste: 'auto' (long text only), 'true' (always), 'false' (never)
+        self.paste_mode = os.getenv('PASTE_MODE', 'auto').lower()
         
         # Recording state
         self.is_recording = False
-        self.audio_frames = []
+        # Set whenever no recording thread is running, so stopping can wait
+        # for the loop to exit instead of sleeping a fixed time
+        self._record_done = threading.Event()
+        self._record_done.set()
+        # Set by stop_recording; the recorder checks it once audio is ready
+        # and its watch loop sleeps on it, so a release is never missed
+        self._stop_requested = threading.Event()
+        # Pre-allocated PCM buffer sized for the longest allowed recording;
+        # chunks are copied in place instead of appended to a list of bytes
+        self._max_samples = self.rate * self.record_seconds
+        self._pcm = np.empty(self._max_samples, dtype=np.int16)
+        self._write_idx = 0
         self.audio = None
         self.stream = None
-        self.temp_files = set()  # Track temporary files
         
-        # Initialize audio with retry
-        self._initialize_audio()
+        # Persistent workers reused across hotkey presses: a dedicated
+        # recorder, so a press never queues behind slow uploads, plus two
+        # overlapping transcriptions
+        self._record_exec = ThreadPoolExecutor(max_workers=1, thread_name_prefix='vt-rec')
+        self._pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix='vt')
+        # The DSP kernels (and Numba's compile, if installed) load in the
+        # background so the hotkey listener is up sooner
+        self._pool.submit(importlib.import_module, 'voice_transcriber_dsp')
+        
+        # Streaming mode (opt-in: a segment boundary can split a word)
+        self.streaming = os.getenv('STREAMING', 'false').lower() == 'true'
+        self._segment_samples = self.rate * SEGMENT_SECONDS
+        self._segment_start = 0
+        self._segment_futures = []
+        self._segment_pool = (
+            ThreadPoolExecutor(max_workers=SEGMENT_WORKERS, thread_name_prefix='vt-seg')
+            if self.streaming else None
+        )
+        
+        # Initialize audio with retry on a background thread; PortAudio
+        # device probing overlaps the rest of startup and run() waits for it
+        self._audio_ready = threading.Event()
+        self._audio_error = None
+        threading.Thread(target=self._initialize_audio_async, daemon=True).start()
         
         # Using Globe/Fn key as hotkey
         self.using_globe_key = True
@@ -107,6 +219,16 @@ class VoiceTranscriber:
         # Language setting
         self.language = os.getenv('LANGUAGE', 'en')
         
+        # Voice activity detection for trimming silent edges (WebRTC VAD
+        # only supports 8/16/32/48 kHz; otherwise an energy gate is used)
+        self.vad_enabled = os.getenv('VAD_ENABLED', 'true').lower() == 'true'
+        # Clips quieter than this overall RMS are not sent for transcription
+        self.skip_rms_threshold = float(os.getenv('VAD_RMS_THRESHOLD', 150))
+        if self.vad_enabled and webrtcvad and self.rate in (8000, 16000, 32000, 48000):
+            self.vad = webrtcvad.Vad(2)
+        else:
+            self.vad = None
+        
         # Keyboard listener
         self.keyboard_listener = None
         
@@ -114,19 +236,88 @@ class VoiceTranscriber:
         self.filler_words = {
             'um', 'uh', 'er', 'ah', 'like', 'you know', 'so', 'well',
             'hmm', 'okay', 'right', 'actually', 'basically', 'literally',
-            'i mean', 'sort of', 'kind of', 'you see'
+            'i mean', 'sort of', 'kind of', 'you see', 'yeah'
         }
         
+        self._remove_fillers = os.getenv('REMOVE_FILLER_WORDS', 'true').lower() == 'true'
+        
         # Add custom filler words from config
         custom_fillers = os.getenv('CUSTOM_FILLER_WORDS', '')
         if custom_fillers:
-            custom_list = [word.strip() for word in custom_fillers.split(',')]
+            custom_list = [word.strip() for word in custom_fillers.split(',') if word.strip()]
             self.filler_words.update(custom_list)
+            
+        # Pre-compile regex patterns for performance
+        self._compile_text_patterns()
         
         logger.info(f"🎙️ Voice Transcriber initialized")
         logger.info(f"📋 Hotkey: Globe/Fn key")
         logger.info(f"🌍 Language: {self.language}")
         logger.info(f"⏱️ Max recording time: {self.record_seconds}s")
+        
+        # Build the client and open the TLS connection off the main thread,
+        # so neither startup nor the first transcription pays for them
+        if self._api_key:
+            threading.Thread(target=self._warm_openai, daemon=True).start()
+
+    def _load_local_model(self):
+        """Load the faster-whisper model once (int8 on CPU), or None if unavailable"""
+        try:
+            # Deferred import: CTranslate2 is heavy and only needed for this backend
+            from faster_whisper import WhisperModel
+        except ImportError:
+            logger.warning("⚠️ WHISPER_BACKEND=local needs faster-whisper (pip install faster-whisper); using OpenAI")
+            return None
+        
+        model_name = os.getenv('WHISPER_MODEL', 'base')
+        try:
+            model = WhisperModel(model_name, device='cpu', compute_type='int8',
+                                 cpu_threads=os.cpu_count() or 0)
+        except Exception as e:
+            logger.error(f"❌ Failed to load local Whisper model '{model_name}': {e}")
+            return None
+        logger.info(f"🧠 Local Whisper model loaded: {model_name} (int8)")
+        return model
+
+    @cached_property
+    def client(self):
+        """OpenAI client, created on first use (None without an API key)"""
+        if not self._api_key:
+            return None
+        # Imported here rather than at module level so check_dependencies()
+        # runs without paying for the SDK's httpx/pydantic import
+        from openai import OpenAI
+        return OpenAI(api_key=self._api_key)
+
+    def _warm_openai(self):
+        """Establish a pooled connection to the OpenAI API ahead of the first request"""
+        try:
+            self.client.models.list()
+        except Exception as e:
+            logger.debug(f"OpenAI connection warm-up failed: {e}")
+
+    def _compile_text_patterns(self):
+        """Pre-compile the filler word pattern for single-pass removal"""
+        if self.filler_words:
+            # Sort by length (longest first) so multi-word fillers win
+            sorted_fillers = sorted(self.filler_words, key=len, reverse=True)
+            escaped_fillers = [re.escape(filler) for filler in sorted_fillers]
+            # Whole whitespace-delimited tokens only, like the old token loop:
+            # word boundaries would also split at hyphens and turn "so-called"
+            # into "-called". A trailing punctuation mark goes with the filler
+            pattern = r'(?<!\S)(?:' + '|'.join(escaped_fillers) + r')[.,!?;:"()\[\]{}]?(?=\s|$)'
+            self.filler_pattern = re.compile(pattern, re.IGNORECASE)
+        else:
+            self.filler_pattern = None
+
+    def _initialize_audio_async(self):
+        """Run _initialize_audio on a background thread and record the outcome"""
+        try:
+            self._initialize_audio()
+        except Exception as e:
+            self._audio_error = e
+        finally:
+            self._audio_ready.set()
 
     def _initialize_audio(self):
         """Initialize PyAudio with retry logic"""
@@ -149,6 +340,10 @@ class VoiceTranscriber:
                 # Create new PyAudio instance
                 self.audio = pyaudio.PyAudio()
                 
+                if self.auto_chunk_size:
+                    self.chunk = self._autotune_chunk_size()
+                    logger.info(f"🎚️ Auto-tuned chunk size: {self.chunk} frames")
+                
                 # Test audio setup with proper cleanup
                 test_stream = None
                 try:
@@ -193,139 +388,126 @@ class VoiceTranscriber:
                     logger.error("❌ Failed to initialize audio after multiple attempts")
                     raise
 
+    def _autotune_chunk_size(self):
+        """Pick a power-of-two chunk size from the device's low input latency"""
+        try:
+            device_info = self.audio.get_device_info_by_index(self.input_device_index)
+            latency_frames = device_info['defaultLowInputLatency'] * self.rate
+        except Exception as e:
+            logger.debug(f"Could not query input latency, keeping default chunk size: {e}")
+            return 2048
+
+        # Round the device's own buffer size up to a power of two, clamped to
+        # 512-8192 frames: smaller chunks wake the CPU too often on slow
+        # machines, larger ones add latency and overflow risk
+        exponent = math.ceil(math.log2(max(latency_frames, 1)))
+        return 1 << max(9, min(13, exponent))
+
     def clean_text(self, text):
         """Remove filler words and clean up the transcribed text"""
         if not text:
             return ""
-            
-        # Convert to lowercase for processing
-        words = text.lower().split()
-        
-        # Remove filler words if enabled
-        remove_fillers = os.getenv('REMOVE_FILLER_WORDS', 'true').lower() == 'true'
-        if remove_fillers:
-            cleaned_words = []
-            i = 0
-            while i < len(words):
-                word = words[i].strip('.,!?;:"()[]{}')
-                
-                # Check for multi-word fillers like "you know", "i mean"
-                skip = False
-                for filler_length in [3, 2, 1]:  # Check longer phrases first
-                    if i + filler_length <= len(words):
-                        phrase = ' '.join(words[i:i+filler_length]).strip('.,!?;:"()[]{}')
-                        if phrase in self.filler_words:
-                            i += filler_length
-                            skip = True
-                            break
-                
-                if not skip:
-                    cleaned_words.append(words[i])
-                    i += 1
-            
-            words = cleaned_words
         
-        # Reconstruct text
-        cleaned_text = ' '.join(words)
+        if not self._remove_fillers or not self.filler_pattern:
+            return self.improve_grammar(text)
+        
+        # Strip sentence-opening fillers with their trailing comma first, then
+        # the rest (single pre-compiled regex pass each)
+        text = LEADING_FILLER_PATTERN.sub(r'\1', text)
+        text = self.filler_pattern.sub('', text).lstrip(STRAY_LEADING_PUNCTUATION).strip()
         
         # Basic grammar improvements
-        cleaned_text = self.improve_grammar(cleaned_text)
+        cleaned_text = self.improve_grammar(text)
         
         return cleaned_text
     
     def improve_grammar(self, text):
-        """Basic grammar improvements"""
+        """Basic grammar improvements (pre-compiled module-level patterns)"""
         if not text:
             return ""
-            
-        # Capitalize first letter
-        text = text[0].upper() + text[1:] if len(text) > 1 else text.upper()
         
-        # Capitalize after periods
-        text = re.sub(r'(\. )([a-z])', lambda m: m.group(1) + m.group(2).upper(), text)
+        # Fix common spacing issues first so capitalization sees clean text
+        text = MULTIPLE_SPACES_PATTERN.sub(' ', text).strip()  # Multiple spaces to single space
+        text = SPACE_BEFORE_PUNCT_PATTERN.sub(r'\1', text)  # Remove space before punctuation
         
-        # Fix common spacing issues
-        text = re.sub(r'\s+', ' ', text)  # Multiple spaces to single space
-        text = re.sub(r'\s+([.!?,:;])', r'\1', text)  # Remove space before punctuation
+        # Capitalize first letter and the start of each sentence
+        text = text[:1].upper() + text[1:]
+        text = SENTENCE_START_PATTERN.sub(_upper_match, text)
         
         # Capitalize 'I'
-        text = re.sub(r'\bi\b', 'I', text)
+        text = I_WORD_PATTERN.sub('I', text)
         
-        return text.strip()
+        return text
     
     def start_recording(self):
         """Start recording audio"""
-        # Start recording in a separate thread
-        recording_thread = threading.Thread(target=self._record_audio)
-        recording_thread.daemon = True
-        recording_thread.start()
+        # Recording state changes on the caller's thread, so a release that
+        # arrives before the recorder runs still stops it
+        self.is_recording = True
+        self._stop_requested.clear()
+        self._record_done.clear()
+        self._record_exec.submit(self._record_audio)
 
     def _record_audio(self):
         """Internal method to handle the actual recording"""
+        # Audio may still be initializing if the hotkey was pressed right away
+        self._audio_ready.wait()
         try:
+            # The key may have been released while audio was initializing;
+            # empty the buffer so the previous clip isn't processed again
+            if self._stop_requested.is_set():
+                self._write_idx = 0
+                return
+            
             # Clean up any existing stream first
             self._cleanup_stream()
 
+            # Chunks are delivered to _on_audio_chunk on PortAudio's own
+            # thread, so reset the buffer before the stream starts
+            self._write_idx = 0
+            self._segment_start = 0
+            self._segment_futures = []
             self.stream = self.audio.open(
                 format=self.format,
                 channels=self.channels,
                 rate=self.rate,
                 input=True,
                 input_device_index=self.input_device_index,
-                frames_per_buffer=self.chunk
+                frames_per_buffer=self.chunk,
+                stream_callback=self._on_audio_chunk
             )
             
-            self.is_recording = True
-            self.audio_frames = []
             self.recording_start_time = time.perf_counter()  # Track recording start time
             
             logger.info("🎤 Recording... Release Globe/Fn key when done.")
             
             start_time = time.time()
-            last_device_check = time.time()
-            estimated_memory = 0
-            max_memory_mb = float(os.getenv('MAX_MEMORY_MB', 100))  # Default 100MB limit
             
-            # Record in chunks
-            while self.is_recording:
-                try:
-                    # Periodic device check (every 2 seconds)
-                    current_time = time.time()
-                    if current_time - last_device_check > 2:
-                        if not self._check_device_available():
-                            logger.error("❌ Audio device became unavailable")
-                            break
-                        last_device_check = current_time
-
-                    # Check if stream is still active
-                    if not self.stream.is_active():
-                        logger.error("❌ Audio stream became inactive")
-                        break
-
-                    # Read audio data
-                    data = self.stream.read(self.chunk, exception_on_overflow=False)
-                    self.audio_frames.append(data)
-                    
-                    # Estimate memory usage (2 bytes per sample)
-                    chunk_memory = len(data)
-                    estimated_memory += chunk_memory
-                    if estimated_memory > max_memory_mb * 1024 * 1024:
-                        logger.warning(f"⚠️ Memory limit reached ({max_memory_mb}MB)")
-                        break
-                    
-                    # Check for maximum recording time
-                    if time.time() - start_time > self.record_seconds:
+            # Watch for stop conditions while the callback captures audio
+            while not self._stop_requested.wait(timeout=0.05):
+                # The stream goes inactive when the buffer is full or the
+                # device disappears, so no separate device poll is needed
+                if not self.stream.is_active():
+                    if self._write_idx >= self._max_samples:
                         logger.info(f"⏰ Maximum recording time ({self.record_seconds}s) reached")
-                        break
-                        
-                except Exception as e:
-                    logger.error(f"Error reading audio: {e}")
-                    # Try to recover from transient errors
-                    if "Input overflowed" in str(e):
-                        logger.warning("⚠️ Input overflow detected, continuing recording")
-                        continue
+                    else:
+                        logger.error("❌ Audio stream became inactive")
+                    break
+
+                # Memory usage is the buffer cursor times the sample width
+                if self._write_idx * self._sample_width > self._max_memory_bytes:
+                    logger.warning(f"⚠️ Memory limit reached ({self.max_memory_mb}MB)")
+                    break
+                
+                # Check for maximum recording time
+                if time.time() - start_time > self.record_seconds:
+                    logger.info(f"⏰ Maximum recording time ({self.record_seconds}s) reached")
                     break
                 
+                # Upload each completed segment while recording continues
+                if self.streaming:
+                    self._dispatch_segments()
+                
         except Exception as e:
             logger.error(f"❌ Error during recording: {e}")
             if "Invalid sample rate" in str(e):
@@ -334,24 +516,63 @@ class VoiceTranscriber:
                 logger.info("💡 Check your microphone connection and permissions")
         finally:
             self._cleanup_stream()
+            self._record_done.set()
+
+    def _on_audio_chunk(self, in_data, frame_count, time_info, status_flags):
+        """PortAudio stream callback - copy each chunk into the PCM buffer"""
+        # Input overflows are reported in status_flags; PortAudio has already
+        # dropped the lost frames, so recording simply continues
+        start = self._write_idx
+        end = min(start + frame_count, self._max_samples)
+        self._pcm[start:end] = np.frombuffer(in_data, dtype=np.int16, count=end - start)
+        self._write_idx = end
+        if end >= self._max_samples:
+            return (None, pyaudio.paComplete)
+        return (None, pyaudio.paContinue)
+
+    def _dispatch_segments(self, final=False):
+        """Submit every completed segment (and the tail, if final) for transcription"""
+        while self._write_idx - self._segment_start >= self._segment_samples or (
+                final and self._write_idx > self._segment_start):
+            start = self._segment_start
+            end = min(start + self._segment_samples, self._write_idx)
+            # Copy out: the next recording reuses the PCM buffer
+            pcm = self._pcm[start:end].copy()
+            self._segment_futures.append(self._segment_pool.submit(self._transcribe_segment, pcm))
+            self._segment_start = end
+
+    def _transcribe_segment(self, pcm):
+        """Trim and transcribe one streaming segment"""
+        if self._is_silent(pcm):
+            return ""
+        return self.transcribe_audio(self._trim_silence(pcm))
 
-    def _check_device_available(self):
-        """Check if the audio device is still available"""
-        try:
-            audio = pyaudio.PyAudio()
-            device_info = audio.get_device_info_by_index(self.input_device_index)
-            audio.terminate()
-            return device_info['maxInputChannels'] > 0
-        except:
-            return False
+    def _is_silent(self, pcm):
+        """True when the clip's RMS level is below the skip threshold"""
+        from voice_transcriber_dsp import rms_int16
+        
+        return rms_int16(pcm) < self.skip_rms_threshold
+
+    def _collect_segments(self, futures):
+        """Join the segment transcripts in recording order"""
+        texts = []
+        for i, future in enumerate(futures, 1):
+            try:
+                text = future.result()
+            except Exception as e:
+                logger.error(f"❌ Segment {i}/{len(futures)} failed: {e}")
+                continue
+            if text:
+                texts.append(text.strip())
+        return ' '.join(texts)
 
     def _cleanup_stream(self):
         """Clean up the audio stream with proper error handling"""
         if hasattr(self, 'stream') and self.stream:
             try:
+                # stop_stream() blocks until the callback has returned
                 if self.stream.is_active():
                     self.stream.stop_stream()
-                time.sleep(0.1)  # Give time for the stream to fully stop
                 self.stream.close()
             except Exception as e:
                 logger.debug(f"Error during stream cleanup: {e}")
@@ -364,47 +585,58 @@ class VoiceTranscriber:
         
         # Set flag first to stop recording loop
         self.is_recording = False
+        self._stop_requested.set()
         
-        # Give time for recording loop to finish
-        time.sleep(0.2)
+        # Wait for the recording loop to notice and exit; if it hasn't, the
+        # buffer may still hold the previous clip, so don't process it
+        if not self._record_done.wait(timeout=1.0):
+            logger.warning("⚠️ Recording did not stop in time - skipped transcription")
+            return
         
         # Clean up stream
         self._cleanup_stream()
 
-        if not self.audio_frames:
+        if not self._write_idx:
             logger.warning("⚠️ No audio data recorded")
             return
 
         # Calculate recording duration and data size
         if hasattr(self, 'recording_start_time'):
             recording_duration = stop_time - self.recording_start_time
-            audio_size = sum(len(frame) for frame in self.audio_frames)
-            logger.info(f"📊 Recording stats: {recording_duration:.1f}s duration, {audio_size} bytes, {len(self.audio_frames)} chunks")
-
-        # Process the recording in a separate thread
-        processing_thread = threading.Thread(target=self._process_audio)
-        processing_thread.daemon = True
-        processing_thread.start()
+            audio_size = self._write_idx * 2
+            logger.info(f"📊 Recording stats: {recording_duration:.1f}s duration, {audio_size} bytes, {self._write_idx} samples")
+
+        # Hand the job a copy: the next press refills the PCM buffer while
+        # this job may still be queued behind an earlier upload
+        if self.streaming:
+            self._dispatch_segments(final=True)
+            pcm, segment_futures = None, self._segment_futures
+            self._segment_futures = []
+        else:
+            pcm, segment_futures = self._pcm[:self._write_idx].copy(), None
+        
+        # Process the recording on a pooled worker thread
+        self._pool.submit(self._process_audio, pcm, segment_futures)
 
-    def _process_audio(self):
-        """Process the recorded audio with detailed timing"""
+    def _process_audio(self, pcm, segment_futures=None):
+        """Process the recorded audio (or streamed segments) with detailed timing"""
         process_start = time.perf_counter()
         try:
-            # Save audio to file
-            file_start = time.perf_counter()
-            audio_file = self.save_audio_to_file()
-            file_time = (time.perf_counter() - file_start) * 1000
-            
-            if not audio_file:
-                logger.error("❌ Failed to save audio file")
-                return
-
-            logger.info(f"📊 Audio file created in {file_time:.1f}ms")
-
-            # Transcribe audio
-            transcribe_start = time.perf_counter()
-            logger.info("🔄 Transcribing audio with OpenAI...")
-            text = self.transcribe_audio(audio_file)
+            if segment_futures is not None:
+                # Earlier segments are already uploaded; wait for the rest
+                transcribe_start = time.perf_counter()
+                logger.info(f"🔄 Transcribing final segment with {self._backend_label}...")
+                text = self._collect_segments(segment_futures)
+            else:
+                # Accidental taps and room tone: skip the round trip entirely
+                if self._is_silent(pcm):
+                    logger.info("🔇 Recording is silence - skipped transcription")
+                    return
+                
+                # Transcribe audio (the buffer is only encoded for the API)
+                transcribe_start = time.perf_counter()
+                logger.info(f"🔄 Transcribing audio with {self._backend_label}...")
+                text = self.transcribe_audio(self._trim_silence(pcm))
             transcribe_time = (time.perf_counter() - transcribe_start) * 1000
             
             if not text:
@@ -437,132 +669,184 @@ class VoiceTranscriber:
         except Exception as e:
             logger.error(f"❌ Processing error: {e}")
         finally:
-            # Cleanup is handled by the temp_files tracking system
+            # No file cleanup needed since we use in-memory buffers
             pass
     
+    def transcribe_audio(self, pcm):
+        """Transcribe int16 PCM samples with the configured backend"""
+        if self._local_model is not None:
+            try:
+                return self._transcribe_local(pcm)
+            except Exception as e:
+                if not self._api_key:
+                    raise
+                logger.warning(f"⚠️ Local transcription failed, falling back to OpenAI: {e}")
+        
+        # The API needs a file upload, so encode an in-memory buffer
+        buffer_start = time.perf_counter()
+        audio_buffer = self._encode_audio(pcm)
+        if not audio_buffer:
+            logger.error("❌ Failed to create audio buffer")
+            return ""
+        logger.info(f"📊 Audio buffer created in {(time.perf_counter() - buffer_start) * 1000:.1f}ms")
+        return self._transcribe_openai(audio_buffer)
+
+    def _transcribe_local(self, pcm):
+        """Transcribe int16 PCM samples with the local faster-whisper model"""
+        if self.rate == WHISPER_SAMPLE_RATE:
+            # Hand over float32 samples directly: no WAV encode for the
+            # model's decoder to parse straight back
+            audio = pcm.astype(np.float32)
+            audio *= 1.0 / 32768
+        else:
+            # Let faster-whisper's decoder resample other rates
+            audio = self._encode_audio(pcm)
+        segments, _ = self._local_model.transcribe(
+            audio,
+            language=None if self.language == 'auto' else self.language,
+            beam_size=1,
+            vad_filter=True
+        )
+        return ' '.join(segment.text.strip() for segment in segments)
+
     @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=4, max=10))
-    def transcribe_audio(self, audio_file_path):
-        """Transcribe audio file using OpenAI Whisper API with retry logic"""
+    def _transcribe_openai(self, audio_buffer):
+        """Transcribe an in-memory WAV buffer using OpenAI Whisper API with retry logic"""
         try:
-            with open(audio_file_path, "rb") as audio_file:
-                transcript = self.client.audio.transcriptions.create(
-                    model="whisper-1",
-                    file=audio_file,
-                    language=self.language
-                )
-                return transcript.text
+            # Rewind in case a previous attempt already consumed the buffer
+            audio_buffer.seek(0)
+            transcript = self.client.audio.transcriptions.create(
+                model="whisper-1",
+                file=audio_buffer,
+                language=self.language
+            )
+            return transcript.text
         except Exception as e:
             logger.error(f"Error during transcription: {e}")
             raise
     
-    def save_audio_to_file(self):
-        """Save recorded audio to a temporary file"""
-        if not self.audio_frames:
-            return None
+    def _encode_audio(self, pcm):
+        """Encode int16 PCM as an in-memory file (Opus for long clips, WAV otherwise)"""
+        # Opus is ~10x smaller than PCM and upload time dominates long clips
+        use_opus = self.audio_codec == 'opus' or (
+            self.audio_codec == 'auto' and len(pcm) >= OPUS_MIN_SECONDS * self.rate)
+        if soundfile and use_opus:
+            try:
+                audio_buffer = io.BytesIO()
+                audio_buffer.name = "audio.ogg"
+                soundfile.write(audio_buffer, pcm, self.rate,
+                                format='OGG', subtype='OPUS')
+                audio_buffer.seek(0)
+                return audio_buffer
+            except Exception as e:
+                logger.debug(f"Opus encoding unavailable, falling back to WAV: {e}")
 
         try:
-            temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.wav')
-            self.temp_files.add(temp_file.name)  # Track the temporary file
-
-            with wave.open(temp_file.name, 'wb') as wf:
+            audio_buffer = io.BytesIO()
+            audio_buffer.name = "audio.wav"  # The SDK uses the name to detect the format
+            
+            with wave.open(audio_buffer, 'wb') as wf:
                 wf.setnchannels(self.channels)
-                wf.setsampwidth(self.audio.get_sample_size(self.format))
+                wf.setsampwidth(self._sample_width)
                 wf.setframerate(self.rate)
-                wf.writeframes(b''.join(self.audio_frames))
-
-            return temp_file.name
+                wf.writeframes(pcm)
+            
+            audio_buffer.seek(0)
+            return audio_buffer
         except Exception as e:
-            logger.error(f"Error saving audio file: {e}")
-            if temp_file and os.path.exists(temp_file.name):
-                try:
-                    os.remove(temp_file.name)
-                except:
-                    pass
+            logger.error(f"Error creating audio buffer: {e}")
             return None
     
+    def _trim_silence(self, pcm):
+        """Trim leading/trailing silence, keeping a guard band around speech"""
+        if not self.vad_enabled:
+            return pcm
+
+        frame = self.rate * VAD_FRAME_MS // 1000
+        if self.vad:
+            num_frames = len(pcm) // frame
+
+            def is_speech(i):
+                return self.vad.is_speech(pcm[i * frame:(i + 1) * frame].tobytes(), self.rate)
+
+            first = next((i for i in range(num_frames) if is_speech(i)), None)
+            if first is None:
+                return pcm  # No speech detected; leave the clip untouched
+            last = next(i for i in range(num_frames - 1, first - 1, -1) if is_speech(i))
+            voiced_start, voiced_end = first * frame, (last + 1) * frame
+        else:
+            # Energy gate over the same frames (Numba/NumPy kernel)
+            from voice_transcriber_dsp import silence_edges
+            voiced_start, voiced_end = silence_edges(pcm, frame, SILENCE_RMS_THRESHOLD)
+            if voiced_end <= voiced_start:
+                return pcm
+
+        guard = self.rate * VAD_GUARD_MS // 1000
+        start = max(0, voiced_start - guard)
+        end = min(len(pcm), voiced_end + guard)
+        if end - start < len(pcm):
+            trimmed_ms = (len(pcm) - (end - start)) * 1000 // self.rate
+            logger.info(f"✂️ Trimmed {trimmed_ms}ms of silence before upload")
+        return pcm[start:end]
+
     def type_text(self, text):
         """Type the transcribed text at the current cursor position"""
         try:
+            # Deferred import: pyautogui probes the display server on import
+            import pyautogui
+            
             # Small delay to ensure the cursor is ready
             time.sleep(0.1)
             
-            # Get typing interval from config
-            interval = float(os.getenv('TYPING_INTERVAL', 0.01))
+            # One paste instead of one synthetic keystroke per character
+            if self.paste_mode == 'true' or (self.paste_mode == 'auto' and len(text) > PASTE_MIN_CHARS):
+                try:
+                    self._paste_text(text, pyautogui)
+                    return
+                except Exception as e:
+                    logger.warning(f"⚠️ Clipboard paste failed, typing instead: {e}")
             
             # Type the text
-            pyautogui.write(text, interval=interval)
+            pyautogui.write(text, interval=self.typing_interval)
             
         except Exception as e:
             print(f"❌ Error typing text: {e}")
             print("💡 Make sure to click in a text field before recording")
     
+    def _paste_text(self, text, pyautogui):
+        """Paste text via the clipboard, restoring the previous contents afterwards"""
+        import pyperclip
+        
+        previous = pyperclip.paste()
+        pyperclip.copy(text)
+        modifier = 'command' if sys.platform == 'darwin' else 'ctrl'
+        pyautogui.hotkey(modifier, 'v')
+        
+        # Restore the user's clipboard once the target app has read it
+        restore_timer = threading.Timer(0.5, pyperclip.copy, args=(previous,))
+        restore_timer.daemon = True
+        restore_timer.start()
+    
+    def _is_globe_key(self, key):
+        """Check whether a key event is the Globe/Fn hotkey or one of its fallbacks"""
+        # Runs on the OS input thread for every keystroke, so hash lookups only
+        return key in GLOBE_KEYS or getattr(key, 'vk', None) == GLOBE_VK
+
     def on_press(self, key):
         """Handle key press events"""
-        try:
-            # Check for Globe key (Fn key) - multiple detection methods
-            globe_key_detected = False
-            
-            # Method 1: Direct Fn key detection (if available)
-            if hasattr(keyboard.Key, 'fn') and key == keyboard.Key.fn:
-                globe_key_detected = True
-            
-            # Method 2: String comparison for Fn key
-            elif str(key) == 'Key.fn':
-                globe_key_detected = True
-                
-            # Method 3: Virtual key code for Fn key (macOS specific)
-            elif hasattr(key, 'vk') and key.vk == 179:
-                globe_key_detected = True
-                
-            # Method 4: Right Command key as alternative (more reliable on macOS)
-            elif key == keyboard.Key.cmd_r:
-                globe_key_detected = True
-                
-            # Method 5: F13 key as alternative (often unmapped and available)
-            elif hasattr(key, 'name') and key.name == 'f13':
-                globe_key_detected = True
-            
-            if globe_key_detected and not self.globe_pressed:
-                self.globe_pressed = True
-                # Start recording immediately
-                self.start_recording()
-                
-        except AttributeError:
-            pass
+        if self.globe_pressed or not self._is_globe_key(key):
+            return
+        self.globe_pressed = True
+        # Start recording immediately
+        self.start_recording()
 
     def on_release(self, key):
         """Handle key release events"""
-        try:
-            # Check for Globe key (Fn key) release - multiple detection methods
-            globe_key_released = False
-            
-            # Method 1: Direct Fn key detection (if available)
-            if hasattr(keyboard.Key, 'fn') and key == keyboard.Key.fn:
-                globe_key_released = True
-            
-            # Method 2: String comparison for Fn key
-            elif str(key) == 'Key.fn':
-                globe_key_released = True
-                
-            # Method 3: Virtual key code for Fn key (macOS specific)
-            elif hasattr(key, 'vk') and key.vk == 179:
-                globe_key_released = True
-                
-            # Method 4: Right Command key as alternative (more reliable on macOS)
-            elif key == keyboard.Key.cmd_r:
-                globe_key_released = True
-                
-            # Method 5: F13 key as alternative (often unmapped and available)
-            elif hasattr(key, 'name') and key.name == 'f13':
-                globe_key_released = True
-            
-            if globe_key_released:
-                self.globe_pressed = False
-                # Stop recording and process immediately
-                self.stop_recording()
-                
-        except AttributeError:
-            pass
+        if not self._is_globe_key(key):
+            return
+        self.globe_pressed = False
+        # Stop recording and process immediately
+        self.stop_recording()
     
     def run(self):
         """Main loop - listen for hotkey"""
@@ -574,6 +858,11 @@ class VoiceTranscriber:
             )
             self.keyboard_listener.start()
             
+            # Audio initialization has been running since __init__
+            self._audio_ready.wait()
+            if self._audio_error:
+                raise self._audio_error
+            
             print(f"🎯 Ready! Press and hold Globe/Fn key (or Right Cmd/F13) to record, release to transcribe.")
             print("💡 Note: If Globe key doesn't work, try Right Command or F13 key")
             print("💡 Position your cursor where you want text to appear")
@@ -615,7 +904,8 @@ class VoiceTranscriber:
             # Stop recording if still active
             if self.is_recording:
                 self.is_recording = False
-                time.sleep(0.2)  # Give recording thread time to stop
+                self._stop_requested.set()
+                self._record_done.wait(timeout=1.0)  # Let the recording thread stop
 
             # Clean up keyboard listener
             if hasattr(self, 'keyboard_listener') and self.keyboard_listener:
@@ -634,15 +924,12 @@ class VoiceTranscriber:
                     logger.debug(f"Error terminating PyAudio: {e}")
                 self.audio = None
 
-            # Clean up temporary files
-            if hasattr(self, 'temp_files'):
-                for temp_file in self.temp_files:
-                    try:
-                        if os.path.exists(temp_file):
-                            os.remove(temp_file)
-                            logger.debug(f"Removed temporary file: {temp_file}")
-                    except Exception as e:
-                        logger.warning(f"Failed to remove temporary file {temp_file}: {e}")
+            # Let in-flight work finish on its own; drop anything still queued
+            if hasattr(self, '_pool'):
+                self._record_exec.shutdown(wait=False, cancel_futures=True)
+                self._pool.shutdown(wait=False, cancel_futures=True)
+            if getattr(self, '_segment_pool', None):
+                self._segment_pool.shutdown(wait=False, cancel_futures=True)
 
         except Exception as e:
             logger.error(f"Error during cleanup: {e}")
@@ -660,9 +947,8 @@ def check_dependencies():
     missing = []
     
     for package in required:
-        try:
-            __import__(package)
-        except ImportError:
+        # find_spec only locates the package; it does not import it
+        if find_spec(package) is None:
             missing.append(package)
     
     if missing:
@@ -672,6 +958,9 @@ def check_dependencies():
     return True
 
 if __name__ == "__main__":
+    # Load environment variables (here, so importing the module stays cheap)
+    load_dotenv()
+    
     print("🎙️ Voice-to-Text Transcription App")
     print("==================================")
     